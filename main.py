@@ -1,12 +1,38 @@
+import contextlib
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIASGIMiddleware
 
 from src.api import utils, contacts, auth, users
+from src.api.limiter import limiter
+from src.api.utils import FastJSONResponse
+from src.cache.redis_cache import pool as redis_pool
+from src.database.db import sessionmanager
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Closes the database and Redis connection pools when the application shuts down.
+
+    Args:
+        app (FastAPI): The application instance.
+    """
+    yield
+    await sessionmanager.close()
+    await redis_pool.aclose()
+
 
 app = FastAPI(
     title="My Application",
     description="This is the main entry point of the FastAPI application.",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 origins = ["http://localhost:8000"]
@@ -20,6 +46,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Register the shared rate limiter and return 429 when a limit is exceeded
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_middleware(SlowAPIASGIMiddleware)
+
 API_PREFIX = "/api"
 
 app.include_router(utils.router, prefix=API_PREFIX)
@@ -33,14 +64,30 @@ def main():
     Run the FastAPI application using uvicorn.
 
     This function serves as the entry point when running the application directly.
-    It launches uvicorn with the specified host, port, and reload settings.
+    It launches uvicorn with uvloop/httptools and a worker pool sized from the
+    environment:
+
+    - HOST, PORT: the bind address. Defaults to 0.0.0.0:8000.
+    - WEB_CONCURRENCY (or WORKERS): the number of worker processes.
+      Defaults to 2 * CPU + 1.
+    - RELOAD: set to 1, true or yes to enable auto-reload for local
+      development. Uvicorn ignores the worker count in this mode.
 
     Returns:
         None
     """
     import uvicorn
 
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
+    workers = os.getenv("WEB_CONCURRENCY") or os.getenv("WORKERS")
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8000)),
+        workers=int(workers) if workers else (os.cpu_count() or 1) * 2 + 1,
+        loop="uvloop",
+        http="httptools",
+        reload=os.getenv("RELOAD", "").strip().lower() in {"1", "true", "yes"},
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+"""add contacts user_id id index
+
+Revision ID: 2da66b4925be
+Revises: ea1ba5fb4049
+Create Date: 2026-10-14 16:12:56.284476
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2da66b4925be'
+down_revision: Union[str, None] = 'ea1ba5fb4049'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contacts_user_id_id', 'contacts', ['user_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_user_id_id', table_name='contacts')
@@ -0,0 +1,41 @@
+"""add contacts birthday_md column
+
+Revision ID: 553209b8f3d5
+Revises: 51b833762811
+Create Date: 2026-10-14 16:22:41.702884
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '553209b8f3d5'
+down_revision: Union[str, None] = '51b833762811'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'contacts',
+        sa.Column(
+            'birthday_md',
+            sa.Integer(),
+            sa.Computed(
+                'CAST(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday) AS INTEGER)',
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        'ix_contacts_user_id_birthday_md', 'contacts', ['user_id', 'birthday_md']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_user_id_birthday_md', table_name='contacts')
+    op.drop_column('contacts', 'birthday_md')
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
+from src.cache.redis_cache import get_redis
 from src.schemas.usesrs import UserCreate, User
 from src.schemas.auth import Token, RequestEmail, ResetPassword
 from src.service.auth import (
@@ -10,28 +12,77 @@ from src.service.auth import (
     get_email_from_token,
     get_email_and_password_from_token,
 )
-from src.service.email import send_email, send_reset_password_email
+from src.service.email_queue import EmailQueue
 from src.service.users import UserService
+from src.service.users_cache import UserCacheService
 from src.database.db import get_db
+from src.database.models import User as UserModel
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _user_conflict(
+    existing_user: UserModel | None, user_data: UserCreate
+) -> HTTPException:
+    """
+    Builds the 409 error for a signup whose email or username is already taken.
+
+    Args:
+        existing_user (UserModel | None): The user that holds the email or the username.
+        user_data (UserCreate): The data of the rejected signup.
+
+    Returns:
+        HTTPException: The error to raise.
+    """
+    if existing_user is not None and existing_user.email == user_data.email:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Користувач з таким email вже існує",
+        )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Користувач з таким іменем вже існує",
+    )
+
+
+async def _get_user_by_email(
+    email: str, db: AsyncSession, redis: Redis
+) -> UserModel | None:
+    """
+    Looks a user up by email, skipping the database for emails recently found missing.
+
+    Args:
+        email (str): The email to look up.
+        db (AsyncSession): The asynchronous database session.
+        redis (Redis): The redis connection holding the negative cache.
+
+    Returns:
+        UserModel | None: The user, or None if there is no user with this email.
+    """
+    user_cache_service = UserCacheService(redis)
+    if await user_cache_service.is_missing("email", email):
+        return None
+    user = await UserService(db).get_user_by_email(email)
+    if user is None:
+        await user_cache_service.set_missing("email", email)
+    return user
+
+
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     """
-    Registers a new user with the given user data, and sends an email for verification.
+    Registers a new user with the given user data, and queues an email for verification.
 
     Args:
         user_data (UserCreate): The data required to create a new user (username, email, password, etc.).
-        background_tasks (BackgroundTasks): FastAPI's background task manager to send verification email asynchronously.
         request (Request): The incoming HTTP request object.
         db (AsyncSession): The asynchronous database session.
+        redis (Redis): The redis connection used for the email queue and the user cache.
 
     Raises:
         HTTPException: If the email or username is already in use.
@@ -41,25 +92,26 @@ async def register_user(
     """
     user_service = UserService(db)
 
-    email_user = await user_service.get_user_by_email(user_data.email)
-    if email_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Користувач з таким email вже існує",
-        )
+    # A cheap lookup first, so a repeated signup does not pay for a password hash
+    existing_user = await user_service.get_user_by_email_or_username(
+        user_data.email, user_data.username
+    )
+    if existing_user is not None:
+        raise _user_conflict(existing_user, user_data)
 
-    username_user = await user_service.get_user_by_username(user_data.username)
-    if username_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Користувач з таким іменем вже існує",
-        )
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
+    new_user = await user_service.create_user_if_absent(user_data)
 
-    user_data.password = Hash().get_password_hash(user_data.password)
-    new_user = await user_service.create_user(user_data)
+    if new_user is None:
+        # A concurrent signup took the email or username after the lookup
+        existing_user = await user_service.get_user_by_email_or_username(
+            user_data.email, user_data.username
+        )
+        raise _user_conflict(existing_user, user_data)
 
-    background_tasks.add_task(
-        send_email, new_user.email, new_user.username, request.base_url
+    await UserCacheService(redis).clear_missing(new_user.email, new_user.username)
+    await EmailQueue(redis).enqueue_verification_email(
+        new_user.email, new_user.username, request.base_url
     )
 
     return new_user
@@ -67,14 +119,24 @@ async def register_user(
 
 @router.post("/login", response_model=Token)
 async def login_user(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     """
     Logs in an existing user using username and password, returning a JWT access token if successful.
 
+    The user is read from the Redis cache when it is there, and is put into the cache
+    otherwise, so that neither repeated logins nor requests made with the new token
+    have to load it from the database. A username that was not found is remembered
+    for a short time, so repeated attempts with it do not reach the database either.
+    A password hashed with a lower bcrypt cost than `BCRYPT_ROUNDS` is hashed again,
+    so a raised cost reaches existing users as they log in.
+
     Args:
         form_data (OAuth2PasswordRequestForm): The OAuth2 form data containing username and password.
         db (AsyncSession): The asynchronous database session.
+        redis (Redis): The redis connection
 
     Raises:
         HTTPException: If the username or password is incorrect, or if the user's email is not confirmed.
@@ -82,9 +144,18 @@ async def login_user(
     Returns:
         Token: A dictionary containing the access token and token type (bearer).
     """
-    user_service = UserService(db)
-    user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    user_cache_service = UserCacheService(redis)
+    user = await user_cache_service.get_user_from_cache(form_data.username)
+    if user is None and not await user_cache_service.is_missing(
+        "username", form_data.username
+    ):
+        user = await UserService(db).get_user_by_username(form_data.username)
+        if user is None:
+            await user_cache_service.set_missing("username", form_data.username)
+    hash_service = Hash()
+    if not user or not await hash_service.verify_password_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неправильний логін або пароль",
@@ -97,18 +168,39 @@ async def login_user(
             detail="Електронна адреса не підтверджена",
         )
 
-    access_token = create_access_token(data={"sub": user.username})
+    if hash_service.needs_rehash(user.hashed_password):
+        hashed_password = await hash_service.get_password_hash_async(form_data.password)
+        user = await UserService(db).reset_password(user.email, hashed_password)
+        # reset_password returns None if the user was deleted after the lookup
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Неправильний логін або пароль",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        await user_cache_service.bump_user_version(user.username)
+
+    await user_cache_service.set_user_to_cache(user)
+
+    access_token = create_access_token(data={"sub": user.username, "uid": user.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/confirmed_email/{token}", summary="Email confirmation")
-async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
+async def confirmed_email(
+    token: str,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+):
     """
     Confirms a user's email using a token sent via email.
 
+    A cached copy of the user is dropped, so the next login sees the confirmation.
+
     Args:
         token (str): The token that was sent to the user’s email.
         db (AsyncSession): The asynchronous database session.
+        redis (Redis): The redis connection
 
     Raises:
         HTTPException: If verification fails or the token is invalid.
@@ -118,44 +210,48 @@ async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     email = await get_email_from_token(token)
     user_service = UserService(db)
-    user = await user_service.get_user_by_email(email)
-    if user is None:
+    username = await user_service.confirmed_email(email)
+    if username is not None:
+        await UserCacheService(redis).bump_user_version(username)
+        return {"message": "Your email has been confirmed."}
+
+    # Nothing was updated: either there is no such user or it is already confirmed
+    if await user_service.get_user_by_email(email) is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Verification error"
         )
-    if user.is_confirmed:
-        return {"message": "Your email has already been confirmed."}
-    await user_service.confirmed_email(email)
-    return {"message": "Your email has been confirmed."}
+    return {"message": "Your email has already been confirmed."}
 
 
 @router.post("/request_email", summary="Request email")
 async def request_email(
     body: RequestEmail,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     """
     Requests a new verification email to be sent to the user.
 
+    An email that is not registered is remembered for a short time, so repeated
+    requests for it do not reach the database.
+
     Args:
         body (RequestEmail): The request body containing the user's email.
-        background_tasks (BackgroundTasks): FastAPI's background task manager to send verification email asynchronously.
         request (Request): The incoming HTTP request object.
         db (AsyncSession): The asynchronous database session.
+        redis (Redis): The redis connection used for the email queue and the user cache.
 
     Returns:
         dict: A message indicating if the email will be sent or if it is already confirmed.
     """
-    user_service = UserService(db)
-    user = await user_service.get_user_by_email(body.email)
+    user = await _get_user_by_email(body.email, db, redis)
 
     if user and user.is_confirmed:
         return {"message": "Your email has already been confirmed."}
     if user:
-        background_tasks.add_task(
-            send_email, user.email, user.username, request.base_url
+        await EmailQueue(redis).enqueue_verification_email(
+            user.email, user.username, request.base_url
         )
     return {"message": "Check your email for confirmation."}
 
@@ -163,9 +259,9 @@ async def request_email(
 @router.post("/reset_password")
 async def reset_password_request(
     body: ResetPassword,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     """
     Initiates a password reset process by sending a reset confirmation email.
@@ -173,13 +269,14 @@ async def reset_password_request(
     This endpoint takes an email and a new password as input. If the user with the provided
     email exists, is confirmed, and is known to the system, a password reset email will be sent
     to the user's email address. The email will contain a link or token to confirm and finalize
-    the password reset process.
+    the password reset process. An email that is not registered is remembered for a
+    short time, so repeated requests for it do not reach the database.
 
     Args:
         body (ResetPassword): The request body containing the user's email and the new desired password.
-        background_tasks (BackgroundTasks): FastAPI background tasks for sending emails asynchronously.
         request (Request): The incoming HTTP request to get the base URL.
         db (AsyncSession): The asynchronous database session dependency.
+        redis (Redis): The redis connection used for the email queue and the user cache.
 
     Raises:
         HTTPException: If the user's email is not confirmed, a 400 error is raised indicating
@@ -188,8 +285,7 @@ async def reset_password_request(
     Returns:
         dict: A message indicating that the user should check their email for confirmation.
     """
-    user_service = UserService(db)
-    user = await user_service.get_user_by_email(body.email)
+    user = await _get_user_by_email(body.email, db, redis)
 
     if not user:
         raise HTTPException(
@@ -197,10 +293,9 @@ async def reset_password_request(
             detail="Your email is not registered",
         )
 
-    hashed_password = Hash().get_password_hash(body.password)
+    hashed_password = await Hash().get_password_hash_async(body.password)
 
-    background_tasks.add_task(
-        send_reset_password_email,
+    await EmailQueue(redis).enqueue_reset_password_email(
         email=body.email,
         username=user.username,
         hashed_password=hashed_password,
@@ -211,13 +306,21 @@ async def reset_password_request(
 
 
 @router.get("/confirm_reset_password/{token}")
-async def confirm_reset_password(token: str, db: AsyncSession = Depends(get_db)):
+async def confirm_reset_password(
+    token: str,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+):
     """
     Confirm and reset the user's password using the provided token.
 
+    The user's cache version is bumped so that already verified access tokens
+    are re-validated on their next use, and the updated user is cached in Redis.
+
     Args:
         token (str): The token containing the user's email and new password.
         db (Session, optional): The database session dependency.
+        redis (Redis): The redis connection
 
     Raises:
         HTTPException: If the token is invalid or the user is not found.
@@ -247,4 +350,8 @@ async def confirm_reset_password(token: str, db: AsyncSession = Depends(get_db))
             detail="The user is not found.",
         )
 
+    user_cache_service = UserCacheService(redis)
+    await user_cache_service.bump_user_version(user.username)
+    await user_cache_service.set_user_to_cache(user)
+
     return {"message": "Password reset successful"}
@@ -1,16 +1,19 @@
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, status, Query, HTTPException
+from fastapi import APIRouter, Depends, status, Query, HTTPException, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
-from src.database.models import User
+from src.database.db import get_db, get_ro_db
+from src.api.utils import etag_response
 from src.schemas.contacts import ContactModel, ContactResponseModel
-from src.service.auth import get_current_user
+from src.service.auth import get_current_user_id
 from src.service.contacts import ContactService
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
+contact_list_adapter = TypeAdapter(List[ContactResponseModel])
+
 
 @router.post(
     "/",
@@ -20,8 +23,8 @@ router = APIRouter(prefix="/contacts", tags=["contacts"])
 )
 async def create_contact(
     body: ContactModel,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user_id: Annotated[int, Depends(get_current_user_id)],
 ) -> ContactResponseModel:
     """
     Create a new contact for the authenticated user.
@@ -29,17 +32,19 @@ async def create_contact(
     Args:
         body (ContactModel): The contact details to create.
         db (AsyncSession): The database session dependency.
-        user (User): The currently authenticated user.
+        user_id (int): The ID of the currently authenticated user.
 
     Returns:
         ContactResponseModel: The newly created contact.
     """
     contact_service = ContactService(db)
-    return await contact_service.create_contact(body, user)
+    return await contact_service.create_contact(body, user_id)
 
 
 @router.get("/", response_model=List[ContactResponseModel], summary="Read contacts")
 async def read_contacts(
+    db: Annotated[AsyncSession, Depends(get_ro_db)],
+    user_id: Annotated[int, Depends(get_current_user_id)],
     firstname: Optional[str] = Query(default=None, max_length=50, min_length=2),
     lastname: Optional[str] = Query(default=None, max_length=50, min_length=2),
     email: Optional[str] = Query(default=None, max_length=150, min_length=5),
@@ -50,12 +55,18 @@ async def read_contacts(
     ),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=5, le=100, ge=5),
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    after_id: Optional[int] = Query(
+        default=None,
+        ge=0,
+        description="ID останнього контакту попередньої сторінки (keyset-пагінація замість skip)",
+    ),
 ) -> List[ContactResponseModel]:
     """
     Retrieve a list of contacts for the authenticated user, optionally filtered by firstname, lastname, email, and/or upcoming birthday.
 
+    The list is validated and encoded to JSON in a single pydantic-core pass instead of
+    going through FastAPI's response_model validation and `jsonable_encoder`.
+
     Args:
         firstname (Optional[str]): Filter contacts by their firstname.
         lastname (Optional[str]): Filter contacts by their lastname.
@@ -63,17 +74,28 @@ async def read_contacts(
         upcoming_birthday_days (Optional[int]): Filter contacts who have birthdays within these many upcoming days.
         skip (int): The number of records to skip for pagination.
         limit (int): The maximum number of records to return.
+        after_id (Optional[int]): The ID of the last contact of the previous page, for keyset pagination.
         db (AsyncSession): The database session dependency.
-        user (User): The currently authenticated user.
+        user_id (int): The ID of the currently authenticated user.
 
     Returns:
         List[ContactResponseModel]: A list of contacts that match the query parameters.
     """
     contact_service = ContactService(db)
     contacts = await contact_service.read_contacts(
-        user, firstname, lastname, email, upcoming_birthday_days, skip, limit
+        user_id,
+        firstname,
+        lastname,
+        email,
+        upcoming_birthday_days,
+        skip,
+        limit,
+        after_id,
     )
-    return contacts
+    body = contact_list_adapter.dump_json(
+        contact_list_adapter.validate_python(contacts, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -81,16 +103,21 @@ async def read_contacts(
 )
 async def read_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_ro_db)],
+    user_id: Annotated[int, Depends(get_current_user_id)],
 ) -> ContactResponseModel:
     """
     Retrieve a single contact by its ID for the authenticated user.
 
+    The response carries an ETag; a request with a matching If-None-Match header
+    gets an empty 304 Not Modified response.
+
     Args:
         contact_id (int): The ID of the contact to retrieve.
+        request (Request): The incoming HTTP request.
         db (AsyncSession): The database session dependency.
-        user (User): The currently authenticated user.
+        user_id (int): The ID of the currently authenticated user.
 
     Raises:
         HTTPException: If the contact is not found.
@@ -99,12 +126,12 @@ async def read_contact(
         ContactResponseModel: The requested contact details.
     """
     contact_service = ContactService(db)
-    contact = await contact_service.read_contact(contact_id, user)
+    contact = await contact_service.read_contact(contact_id, user_id)
     if contact is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found."
         )
-    return contact
+    return etag_response(request, ContactResponseModel.model_validate(contact))
 
 
 @router.put(
@@ -113,8 +140,8 @@ async def read_contact(
 async def update_contact(
     body: ContactModel,
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user_id: Annotated[int, Depends(get_current_user_id)],
 ) -> ContactResponseModel:
     """
     Update an existing contact's details for the authenticated user.
@@ -123,7 +150,7 @@ async def update_contact(
         body (ContactModel): The updated contact details.
         contact_id (int): The ID of the contact to update.
         db (AsyncSession): The database session dependency.
-        user (User): The currently authenticated user.
+        user_id (int): The ID of the currently authenticated user.
 
     Raises:
         HTTPException: If the contact is not found.
@@ -132,7 +159,7 @@ async def update_contact(
         ContactResponseModel: The updated contact.
     """
     contact_service = ContactService(db)
-    contact = await contact_service.update_contact(contact_id, body, user)
+    contact = await contact_service.update_contact(contact_id, body, user_id)
     if contact is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found."
@@ -145,8 +172,8 @@ async def update_contact(
 )
 async def delete_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: Annotated[AsyncSession, Depends(get_db)],
+    user_id: Annotated[int, Depends(get_current_user_id)],
 ) -> ContactResponseModel:
     """
     Delete a contact by its ID for the authenticated user.
@@ -154,7 +181,7 @@ async def delete_contact(
     Args:
         contact_id (int): The ID of the contact to delete.
         db (AsyncSession): The database session dependency.
-        user (User): The currently authenticated user.
+        user_id (int): The ID of the currently authenticated user.
 
     Raises:
         HTTPException: If the contact is not found.
@@ -163,7 +190,7 @@ async def delete_contact(
         ContactResponseModel: The deleted contact's details.
     """
     contact_service = ContactService(db)
-    contact = await contact_service.delete_contact(contact_id, user)
+    contact = await contact_service.delete_contact(contact_id, user_id)
     if contact is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found."
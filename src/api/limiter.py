@@ -0,0 +1,15 @@
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from src.conf.config import config
+
+# A single limiter shared by all routers and registered on the app in main.py.
+# Counters live in Redis, so the limits hold across all uvicorn workers; if Redis
+# is unreachable the limiter falls back to in-memory counters instead of failing.
+# RATE_LIMIT_STORAGE_URI overrides the storage, e.g. "memory://" in tests.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=config.RATE_LIMIT_STORAGE_URI
+    or f"redis://{config.REDIS_HOST}:{config.REDIS_PORT}/0",
+    in_memory_fallback_enabled=True,
+)
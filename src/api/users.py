@@ -1,9 +1,11 @@
+from typing import Annotated
+
 from fastapi import APIRouter, Depends, Request, UploadFile, File
-from redis import Redis
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.limiter import limiter
+from src.api.utils import etag_response
 from src.cache.redis_cache import get_redis
 from src.schemas.usesrs import User
 from src.service.auth import get_current_user, get_current_admin_user
@@ -14,16 +16,23 @@ from src.service.users import UserService
 from src.service.users_cache import UserCacheService
 
 router = APIRouter(prefix="/users", tags=["users"])
-limiter = Limiter(key_func=get_remote_address)
+
+# Configured once, so the Cloudinary SDK is not reconfigured on every upload
+upload_file_service = UploadFileService(
+    config.CLD_NAME, config.CLD_API_KEY, config.CLD_API_SECRET
+)
 
 
 @router.get("/me", response_model=User, description="Limited by 5 requests per minute")
 @limiter.limit("5 per minute")
-async def me(request: Request, user: User = Depends(get_current_user)) -> User:
+async def me(
+    request: Request, user: Annotated[User, Depends(get_current_user)]
+) -> User:
     """
     Retrieve the currently authenticated user's data.
 
-    This endpoint is rate-limited to 5 requests per minute.
+    This endpoint is rate-limited to 5 requests per minute. The response carries an ETag;
+    a request with a matching If-None-Match header gets an empty 304 Not Modified response.
 
     Args:
         request (Request): The incoming HTTP request (used by the limiter for rate-limiting).
@@ -32,19 +41,21 @@ async def me(request: Request, user: User = Depends(get_current_user)) -> User:
     Returns:
         User: The authenticated user's data.
     """
-    return user
+    return etag_response(request, User.model_validate(user))
 
 
 @router.patch("/avatar", response_model=User, summary="Update User avatar")
 async def update_avatar_user(
-    file: UploadFile = File(...),
-    user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    file: Annotated[UploadFile, File()],
+    user: Annotated[User, Depends(get_current_admin_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    redis: Annotated[Redis, Depends(get_redis)],
 ) -> User:
     """
     Update the authenticated user's avatar by uploading a new image to Cloudinary.
 
+    The upload is sent asynchronously so it does not block other requests.
+
     Args:
         file (UploadFile): The uploaded image file.
         user (User): The currently authenticated user.
@@ -54,14 +65,13 @@ async def update_avatar_user(
     Returns:
         User: The updated user object with the new avatar URL.
     """
-    avatar_url = UploadFileService(
-        config.CLD_NAME, config.CLD_API_KEY, config.CLD_API_SECRET
-    ).upload_file(file, user.username)
+    avatar_url = await upload_file_service.upload_file(file, user.username)
 
     user_service = UserService(db)
     user = await user_service.update_avatar_url(user.email, avatar_url)
 
     user_cache_service = UserCacheService(redis)
-    user_cache_service.set_user_to_cache(user)
+    await user_cache_service.bump_user_version(user.username)
+    await user_cache_service.set_user_to_cache(user)
 
     return user
@@ -1,19 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import logging
+import time
+from typing import Any
+
+import pydantic_core
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.database.db import get_db
+from src.database.db import get_ro_db
 
 router = APIRouter(tags=["utils"])
 
+logger = logging.getLogger(__name__)
+
+# How long a successful database check answers the health check without a new query
+HEALTH_CHECK_TTL_SECONDS = 5.0
+_last_healthy_at: float | None = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    A JSON response rendered by pydantic-core's Rust encoder instead of the stdlib `json` module.
+
+    Used as the application's default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def etag_response(request: Request, model: BaseModel) -> Response:
+    """
+    Serializes the model to a JSON response with an ETag computed from its body.
+
+    If the request's If-None-Match header already contains the same ETag, an empty
+    304 Not Modified response is returned instead.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        model (BaseModel): The response model to serialize.
+
+    Returns:
+        Response: Either the JSON response with the ETag header or a 304 response.
+    """
+    body = model.model_dump_json().encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in client_etags or "*" in client_etags:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 
 @router.get("/healthchecker")
-async def healthchecker(db: AsyncSession = Depends(get_db)):
+async def healthchecker(db: AsyncSession = Depends(get_ro_db)):
     """
     A health check endpoint for verifying the application's connectivity to the database.
 
     This endpoint attempts a simple SQL query ("SELECT 1") to ensure that the database connection is functional.
     If the query succeeds and returns a result, the service is considered healthy.
+    Load balancers poll the endpoint several times per second, so a successful check is
+    reused for `HEALTH_CHECK_TTL_SECONDS` and the session does not touch the pool then.
 
     Args:
         db (AsyncSession): The asynchronous database session provided by the dependency injection.
@@ -24,6 +76,13 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
     Returns:
         dict: A success message indicating that the application is running and connected to the database.
     """
+    global _last_healthy_at
+    if (
+        _last_healthy_at is not None
+        and time.monotonic() - _last_healthy_at < HEALTH_CHECK_TTL_SECONDS
+    ):
+        return {"message": "Welcome to FastAPI!"}
+
     try:
         # Execute an asynchronous query
         result = await db.execute(text("SELECT 1"))
@@ -34,9 +93,11 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database is not configured correctly",
             )
+        _last_healthy_at = time.monotonic()
         return {"message": "Welcome to FastAPI!"}
     except Exception as e:
-        print(e)
+        _last_healthy_at = None
+        logger.exception(e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
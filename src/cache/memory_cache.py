@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    A small in-process LRU cache whose entries expire after a fixed time-to-live.
+
+    The cache lives in the memory of a single worker process and is not shared
+    between uvicorn workers, so it should only hold data that can be safely
+    re-validated or that tolerates being stale for at most `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The maximum number of entries. The least recently used entry is evicted when it is exceeded.
+            ttl (float): The number of seconds an entry stays valid after it was set.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the value stored under the key.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Any | None: The cached value, or None if it is missing or expired.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Stores the value under the key, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """
+        Removes the entry stored under the key, if any.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
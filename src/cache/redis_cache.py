@@ -1,7 +1,23 @@
-from redis import Redis
+from redis.asyncio import ConnectionPool, Redis
 
 from src.conf.config import config
 
+pool = ConnectionPool(
+    host=config.REDIS_HOST,
+    port=config.REDIS_PORT,
+    db=0,
+    max_connections=config.REDIS_MAX_CONNECTIONS,
+)
+
 
 def get_redis() -> Redis:
-    return Redis(host=config.REDIS_HOST, port=config.REDIS_PORT, db=0)
+    """
+    Returns a Redis client that shares the module-level connection pool.
+
+    The client object is cheap to create, the connections it uses are kept open
+    in the pool and reused across requests.
+
+    Returns:
+        Redis: The redis connection.
+    """
+    return Redis(connection_pool=pool)
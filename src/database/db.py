@@ -1,8 +1,11 @@
 import contextlib
+from uuid import uuid4
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
@@ -11,23 +14,42 @@ from src.conf.config import config
 
 
 class DatabaseSessionManager:
-    def __init__(self, url: str):
+    def __init__(self, url: str, **engine_kwargs):
         """
         Initializes the DatabaseSessionManager with an asynchronous database engine and session maker.
 
+        Objects are not expired on commit, so they can still be read after the
+        transaction ends without another round-trip to the database.
+
         Args:
             url (str): The database connection URL.
+            **engine_kwargs: Extra arguments for `create_async_engine`, such as the pool settings.
         """
-        self._engine: AsyncEngine | None = create_async_engine(url)
+        self._engine: AsyncEngine | None = create_async_engine(url, **engine_kwargs)
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            class_=AsyncSession,
+            bind=self._engine,
+        )
+        self._read_only_session_maker: async_sessionmaker = async_sessionmaker(
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            class_=AsyncSession,
+            bind=self._engine.execution_options(isolation_level="AUTOCOMMIT"),
         )
 
     @contextlib.asynccontextmanager
-    async def session(self):
+    async def session(self, read_only: bool = False):
         """
         Provides a context manager for an asynchronous database session.
 
+        Args:
+            read_only (bool): Run statements in AUTOCOMMIT mode, without BEGIN/ROLLBACK
+                round-trips around them. Only for sessions that never write.
+
         Yields:
             AsyncSession: The asynchronous SQLAlchemy session object.
 
@@ -35,9 +57,12 @@ class DatabaseSessionManager:
             Exception: If the session maker is not initialized.
             SQLAlchemyError: If a database error occurs, the transaction will be rolled back and the error re-raised.
         """
-        if self._session_maker is None:
+        session_maker = (
+            self._read_only_session_maker if read_only else self._session_maker
+        )
+        if session_maker is None:
             raise Exception("Database session is not initialized")
-        session = self._session_maker()
+        session = session_maker()
         try:
             yield session
         except SQLAlchemyError as e:
@@ -46,8 +71,63 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    async def close(self):
+        """
+        Closes all pooled connections and disposes of the engine.
+
+        Called once on application shutdown. Sessions cannot be opened afterwards.
+        """
+        if self._engine is None:
+            return
+        await self._engine.dispose()
+        self._engine = None
+        self._session_maker = None
+        self._read_only_session_maker = None
+
+
+def engine_options(url: str) -> dict:
+    """
+    Builds the `create_async_engine` options for the given database URL from the settings.
+
+    The pool and asyncpg settings only apply to PostgreSQL. JIT compilation is turned
+    off for the server session: the application only runs short OLTP queries, for
+    which the JIT planning overhead outweighs any gain. Other databases (such as the
+    SQLite engine used by the tests) keep the SQLAlchemy defaults.
+
+    Behind pgbouncer in transaction pooling mode consecutive statements may run on
+    different server connections, so prepared statements cached per connection fail
+    with "prepared statement already exists". With `DB_PGBOUNCER` the statement caches
+    are turned off and every prepared statement gets a unique name.
+
+    Args:
+        url (str): The database connection URL.
 
-sessionmanager = DatabaseSessionManager(config.DB_URL)
+    Returns:
+        dict: The keyword arguments for `create_async_engine`.
+    """
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+    connect_args = {
+        "command_timeout": config.DB_COMMAND_TIMEOUT_SECONDS,
+        "server_settings": {"jit": "off"},
+    }
+    if config.DB_PGBOUNCER:
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": True,
+        "pool_recycle": config.DB_POOL_RECYCLE_SECONDS,
+        "connect_args": connect_args,
+    }
+
+
+sessionmanager = DatabaseSessionManager(config.DB_URL, **engine_options(config.DB_URL))
 
 
 async def get_db():
@@ -55,8 +135,30 @@ async def get_db():
     Dependency function for FastAPI routes that provides an asynchronous database session.
     Used with `Depends` to inject the session into route handlers.
 
+    FastAPI caches dependencies within a request, so the route and every dependency
+    that declares `Depends(get_db)` share one session. The auth dependencies
+    `get_current_user` and `get_current_user_id` declare `Depends(get_ro_db)`
+    instead, so an authenticated route that also uses `get_db` opens two sessions.
+    A session checks a connection out of the pool only when it runs its first
+    statement, so the read-only one connects only when the user is not cached, and
+    routes that declare neither dependency never create a session.
+
     Yields:
         AsyncSession: The asynchronous SQLAlchemy session object.
     """
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_ro_db():
+    """
+    Dependency function for FastAPI routes that only read from the database.
+
+    The session runs in AUTOCOMMIT mode, so plain SELECTs are not wrapped into
+    an explicit transaction.
+
+    Yields:
+        AsyncSession: The asynchronous SQLAlchemy session object.
+    """
+    async with sessionmanager.session(read_only=True) as session:
+        yield session
@@ -10,6 +10,11 @@ from sqlalchemy import (
     Boolean,
     Column,
     Enum as SqlEnum,
+    Index,
+    Computed,
+    cast,
+    extract,
+    column,
 )
 from sqlalchemy.orm import mapped_column, Mapped, DeclarativeBase, relationship
 from sqlalchemy.sql.sqltypes import DateTime, Date
@@ -33,6 +38,18 @@ class Contact(Base):
     email: Mapped[str] = mapped_column(String(150), nullable=False)
     phone: Mapped[str] = mapped_column(String(30), nullable=False)
     birthday: Mapped[date] = mapped_column(Date, nullable=False)
+    # Місяць і день народження у вигляді MMDD, наприклад 521 для 21 травня
+    birthday_md: Mapped[int] = mapped_column(
+        Integer,
+        Computed(
+            cast(
+                extract("month", column("birthday")) * 100
+                + extract("day", column("birthday")),
+                Integer,
+            ),
+            persisted=True,
+        ),
+    )
     comment: Mapped[str] = mapped_column(String(500), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -43,6 +60,32 @@ class Contact(Base):
     )
     user: Mapped["User"] = relationship(backref="contacts")
 
+    __table_args__ = (
+        # Keyset pagination over a user's contacts: WHERE user_id = ? AND id > ? ORDER BY id
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        # Upcoming birthdays: WHERE user_id = ? AND birthday_md BETWEEN ? AND ?
+        Index("ix_contacts_user_id_birthday_md", "user_id", "birthday_md"),
+        # Substring search: WHERE firstname ILIKE '%...%' (needs the pg_trgm extension)
+        Index(
+            "ix_contacts_firstname_trgm",
+            "firstname",
+            postgresql_using="gin",
+            postgresql_ops={"firstname": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_lastname_trgm",
+            "lastname",
+            postgresql_using="gin",
+            postgresql_ops={"lastname": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
+
 
 class User(Base):
     __tablename__ = "users"
@@ -65,7 +108,7 @@ class User(Base):
             "is_confirmed": self.is_confirmed,
             "created_at": self.created_at.isoformat(),
             "avatar": self.avatar,
-            "role": self.role,
+            "role": UserRole(self.role).value,
         }
 
     @classmethod
@@ -78,5 +121,5 @@ class User(Base):
             avatar=data.get("avatar"),
             created_at=datetime.fromisoformat(data.get("created_at")),
             is_confirmed=data.get("is_confirmed"),
-            role=data.get("role"),
+            role=UserRole(data["role"]) if data.get("role") else None,
         )
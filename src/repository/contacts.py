@@ -1,11 +1,18 @@
 from typing import List, Optional
 from datetime import date, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, delete, insert, or_, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
-from src.database.models import Contact, User
-from src.schemas.contacts import ContactModel
+from src.database.models import Contact
+from src.schemas.contacts import ContactModel, ContactResponseModel
+
+# The columns returned by the contact list endpoint; the rest are not fetched
+LIST_COLUMNS = load_only(
+    *(getattr(Contact, field) for field in ContactResponseModel.model_fields),
+    raiseload=True,
+)
 
 
 class ContactsRepository:
@@ -17,119 +24,211 @@ class ContactsRepository:
             session (AsyncSession): The asynchronous database session to be used for database operations.
         """
         self.db = session
-        self.db = session
 
-    async def create_contact(self, body: ContactModel, user: User) -> Contact:
+    async def create_contact(self, body: ContactModel, user_id: int) -> Contact:
         """
         Create a new contact.
 
+        The contact is inserted and returned by a single INSERT ... RETURNING statement.
+
         Args:
             body (ContactModel): The contact to create.
-            user (User): The user the contact belongs to.
+            user_id (int): The ID of the user the contact belongs to.
 
         Returns:
             Contact: The created contact.
         """
-        contact = Contact(**body.model_dump(exclude_unset=True), user_id=user.id)
-        self.db.add(contact)
+        stmt = (
+            insert(Contact)
+            .values(**body.model_dump(exclude_unset=True), user_id=user_id)
+            .returning(Contact)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(contact)
         return contact
 
+    async def create_contacts(
+        self, bodies: List[ContactModel], user_id: int
+    ) -> List[Contact]:
+        """
+        Create several contacts at once.
+
+        The rows are sent as a single batched INSERT ... RETURNING statement and
+        committed in one transaction.
+
+        Args:
+            bodies (List[ContactModel]): The contacts to create.
+            user_id (int): The ID of the user the contacts belong to.
+
+        Returns:
+            List[Contact]: The created contacts, in the order of `bodies`.
+        """
+        if not bodies:
+            return []
+        rows = [
+            {**body.model_dump(exclude_unset=True), "user_id": user_id}
+            for body in bodies
+        ]
+        result = await self.db.scalars(
+            insert(Contact).returning(Contact, sort_by_parameter_order=True), rows
+        )
+        contacts = result.all()
+        await self.db.commit()
+        return contacts
+
     async def read_contacts(
         self,
-        user: User,
+        user_id: int,
         firstname: Optional[str] = None,
         lastname: Optional[str] = None,
         email: Optional[str] = None,
         upcoming_birthday_days: Optional[int] = None,
         skip: int = 0,
         limit: int = 10,
+        after_id: Optional[int] = None,
     ) -> List[Contact]:
         """
         Read contacts from the database.
 
+        All filters and the pagination are applied in a single SQL query, which only
+        fetches the columns of `ContactResponseModel`. The name and email filters are
+        case-insensitive substring matches (ILIKE on PostgreSQL, served by the trigram
+        indexes), "%" and "_" in the search terms match literally. Contacts are ordered
+        by ID, so passing the ID of the last contact of the previous page as `after_id`
+        fetches the next page through the (user_id, id) index without scanning the
+        skipped rows.
+
         Args:
-            user (User): The user the contacts belong to.
+            user_id (int): The ID of the user the contacts belong to.
             firstname (Optional[str]): The firstname to search for. Defaults to None.
             lastname (Optional[str]): The lastname to search for. Defaults to None.
             email (Optional[str]): The email to search for. Defaults to None.
             upcoming_birthday_days (Optional[int]): The number of days to search for contacts with upcoming birthdays. Defaults to None.
             skip (int): The number of contacts to skip. Defaults to 0.
             limit (int): The maximum number of contacts to return. Defaults to 10.
+            after_id (Optional[int]): Return only contacts with a greater ID (keyset pagination). Defaults to None.
 
         Returns:
             List[Contact]: The list of contacts.
         """
-        stmt = select(Contact).filter_by(user=user).offset(skip).limit(limit)
-
+        stmt = (
+            select(Contact)
+            .options(LIST_COLUMNS)
+            .where(Contact.user_id == user_id)
+            .order_by(Contact.id)
+            .offset(skip)
+            .limit(limit)
+        )
+
+        if after_id is not None:
+            stmt = stmt.where(Contact.id > after_id)
         if firstname:
-            stmt = stmt.where(Contact.firstname.match(firstname))
+            stmt = stmt.where(Contact.firstname.icontains(firstname, autoescape=True))
         if lastname:
-            stmt = stmt.where(Contact.lastname.match(lastname))
+            stmt = stmt.where(Contact.lastname.icontains(lastname, autoescape=True))
         if email:
-            stmt = stmt.where(Contact.email.match(email))
+            stmt = stmt.where(Contact.email.icontains(email, autoescape=True))
 
         if upcoming_birthday_days:
-            stmt = stmt.where(
-                Contact.birthday.between(
-                    date.today(), date.today() + timedelta(days=upcoming_birthday_days)
-                )
-            )
+            stmt = stmt.where(self._upcoming_birthday_filter(upcoming_birthday_days))
 
         result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
+
+    @staticmethod
+    def _upcoming_birthday_filter(days: int) -> ColumnElement[bool]:
+        """
+        Build a filter for contacts whose birthday falls within the next `days` days.
+
+        Birthdays are compared by month and day through the indexed `birthday_md`
+        column, so the year of birth does not matter. A window that crosses the end
+        of the year matches the birthdays from today to December 31 and from
+        January 1 to the end of the window.
 
-    async def read_contact(self, contact_id: int, user: User) -> Optional[Contact]:
+        Args:
+            days (int): The number of upcoming days, including today.
+
+        Returns:
+            ColumnElement[bool]: The filter expression.
+        """
+        if days >= 365:
+            return true()
+        start = date.today()
+        end = start + timedelta(days=days)
+        start_md = start.month * 100 + start.day
+        end_md = end.month * 100 + end.day
+        if start_md <= end_md:
+            return Contact.birthday_md.between(start_md, end_md)
+        return or_(Contact.birthday_md >= start_md, Contact.birthday_md <= end_md)
+
+    async def read_contact(self, contact_id: int, user_id: int) -> Optional[Contact]:
         """
         Read a contact from the database.
 
         Args:
             contact_id (int): The ID of the contact to read.
-            user (User): The user the contact belongs to.
+            user_id (int): The ID of the user the contact belongs to.
 
         Returns:
             Optional[Contact]: The contact if it exists, otherwise None.
         """
-        stmt = select(Contact).filter_by(id=contact_id, user=user)
+        stmt = select(Contact).filter_by(id=contact_id, user_id=user_id)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
     async def update_contact(
-        self, contact_id: int, body: ContactModel, user: User
+        self, contact_id: int, body: ContactModel, user_id: int
     ) -> Optional[Contact]:
         """
         Update a contact in the database.
 
+        The contact is updated and returned by a single UPDATE ... RETURNING statement.
+
         Args:
             contact_id (int): The ID of the contact to update.
             body (ContactModel): The contact data to update.
-            user (User): The user the contact belongs to.
+            user_id (int): The ID of the user the contact belongs to.
 
         Returns:
             Optional[Contact]: The updated contact if it exists, otherwise None.
         """
-        contact = await self.read_contact(contact_id, user)
-        if contact:
-            for key, value in body.model_dump(exclude_unset=True).items():
-                setattr(contact, key, value)
-            await self.db.commit()
-            await self.db.refresh(contact)
+        values = body.model_dump(exclude_unset=True)
+        if not values:
+            return await self.read_contact(contact_id, user_id)
+
+        stmt = (
+            update(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user_id)
+            .values(**values)
+            .returning(Contact)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        await self.db.commit()
         return contact
 
-    async def delete_contact(self, contact_id: int, user: User) -> Optional[Contact]:
+    async def delete_contact(self, contact_id: int, user_id: int) -> Optional[Contact]:
         """
         Delete a contact from the database.
 
+        The contact is deleted and returned by a single DELETE ... RETURNING statement.
+
         Args:
             contact_id (int): The ID of the contact to delete.
-            user (User): The user the contact belongs to.
+            user_id (int): The ID of the user the contact belongs to.
 
         Returns:
             Optional[Contact]: The deleted contact if it exists, otherwise None.
         """
-        contact = await self.read_contact(contact_id, user)
-        if contact:
-            await self.db.delete(contact)
-            await self.db.commit()
+        stmt = (
+            delete(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user_id)
+            .returning(Contact)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        await self.db.commit()
         return contact
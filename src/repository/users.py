@@ -1,10 +1,27 @@
-from sqlalchemy import select
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.schemas.usesrs import UserCreate
 from src.database.models import User
 
 
+def _is_unique_violation(error: IntegrityError) -> bool:
+    """
+    Check whether an IntegrityError was raised by a unique constraint.
+
+    Args:
+        error (IntegrityError): The error raised by the database driver.
+
+    Returns:
+        bool: True for a unique violation, False for other constraints such as NOT NULL.
+    """
+    # asyncpg exposes the SQLSTATE code, SQLite only reports it in the message
+    if getattr(error.orig, "sqlstate", None) == "23505":
+        return True
+    return "UNIQUE constraint failed" in str(error.orig)
+
+
 class UserRepository:
     def __init__(self, session: AsyncSession):
         """
@@ -57,6 +74,31 @@ class UserRepository:
         user = await self.db.execute(stmt)
         return user.scalar_one_or_none()
 
+    async def get_user_by_email_or_username(
+        self, email: str, username: str
+    ) -> User | None:
+        """
+        Get a user that has the given email or the given username.
+
+        When the email and the username belong to different users, the user with
+        the email is returned.
+
+        Args:
+            email (str): The email to look for.
+            username (str): The username to look for.
+
+        Returns:
+            User | None: A matching user if found, otherwise None.
+        """
+        stmt = (
+            select(User)
+            .where(or_(User.email == email, User.username == username))
+            .order_by((User.email == email).desc())
+            .limit(1)
+        )
+        user = await self.db.execute(stmt)
+        return user.scalar_one_or_none()
+
     async def create_user(self, body: UserCreate, avatar: str = None) -> User:
         """
         Create a new user.
@@ -79,21 +121,66 @@ class UserRepository:
         await self.db.refresh(user)
         return user
 
-    async def confirmed_email(self, email: str) -> User:
+    async def create_user_if_absent(
+        self, body: UserCreate, avatar: str = None
+    ) -> User | None:
         """
-        Confirm a user's email address.
+        Create a new user with a single INSERT ... RETURNING statement, unless the email or username is taken.
+
+        The unique constraints on email and username decide the conflict, so there is no
+        separate existence check and no race between concurrent registrations.
+
+        Args:
+            body (UserCreate): The user data to create.
+            avatar (str, optional): The URL of the user's avatar. Defaults to None.
+
+        Returns:
+            User | None: The created user, or None if a user with the same email or username already exists.
+
+        Raises:
+            IntegrityError: If the row violates a constraint other than a unique one.
+        """
+        stmt = (
+            insert(User)
+            .values(
+                **body.model_dump(exclude_unset=True, exclude={"password"}),
+                hashed_password=body.password,
+                avatar=avatar,
+                is_confirmed=False,
+            )
+            .returning(User)
+        )
+        try:
+            result = await self.db.execute(stmt)
+            user = result.scalar_one()
+            await self.db.commit()
+        except IntegrityError as err:
+            await self.db.rollback()
+            if not _is_unique_violation(err):
+                raise
+            return None
+        return user
+
+    async def confirmed_email(self, email: str) -> str | None:
+        """
+        Confirm a user's email address with a single UPDATE ... RETURNING statement.
 
         Args:
             email (str): The email of the user to confirm.
 
         Returns:
-            None
+            str | None: The username if the email has been confirmed by this call, None if the user does not exist or is already confirmed.
         """
-        user = await self.get_user_by_email(email)
-        user.is_confirmed = True
+        stmt = (
+            update(User)
+            .where(User.email == email, User.is_confirmed.is_not(True))
+            .values(is_confirmed=True)
+            .returning(User.username)
+        )
+        result = await self.db.execute(stmt)
+        username = result.scalar_one_or_none()
         await self.db.commit()
-        await self.db.refresh(user)
-        return user
+        return username
 
     async def update_avatar_url(self, email: str, url: str) -> User:
         """
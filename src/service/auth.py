@@ -1,28 +1,46 @@
-from datetime import datetime, timedelta, UTC, timezone
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import bcrypt
+
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import EmailStr
-from redis import Redis
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 
+from src.cache.memory_cache import TTLCache
 from src.cache.redis_cache import get_redis
-from src.database.db import get_db
+from src.database.db import get_ro_db
 from src.conf.config import config
 from src.database.models import User, UserRole
 from src.service.users import UserService
 from src.service.users_cache import UserCacheService
 
+# JWT "exp" and "iat" claims are Unix timestamps, so they are computed from time.time()
+EMAIL_TOKEN_EXPIRATION_SECONDS = 7 * 24 * 60 * 60
+
+# bcrypt releases the GIL, so hashing scales up to the number of CPU cores. A separate
+# pool keeps a burst of logins from taking all threads of the default thread pool.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt"
+)
+
 
 class Hash:
     """
     A utility class for hashing and verifying passwords using bcrypt.
-    """
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    Hashing is CPU-bound, so async callers should use the `*_async` methods, which
+    run it in a thread pool and leave the event loop free. The cost factor of new
+    hashes is set by `config.BCRYPT_ROUNDS`, existing hashes are verified with the
+    cost factor stored in them.
+    """
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -35,7 +53,7 @@ class Hash:
         Returns:
             bool: True if the plain password matches the hashed password, False otherwise.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
     def get_password_hash(self, password: str) -> str:
         """
@@ -47,11 +65,138 @@ class Hash:
         Returns:
             str: The hashed password.
         """
-        return self.pwd_context.hash(password)
+        return bcrypt.hashpw(
+            password.encode(), bcrypt.gensalt(rounds=config.BCRYPT_ROUNDS)
+        ).decode()
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Checks whether a hash was made with a lower cost factor than `config.BCRYPT_ROUNDS`.
+
+        A hash with a higher cost factor is kept, so lowering the setting never
+        weakens the hashes that are already stored.
+
+        Args:
+            hashed_password (str): A bcrypt hash in the "$2b$<cost>$..." format.
+
+        Returns:
+            bool: True if the password should be hashed again with the current cost factor.
+        """
+        try:
+            return int(hashed_password.split("$")[2]) < config.BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return True
+
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """
+        Verifies a password like `verify_password`, without blocking the event loop.
+
+        Args:
+            plain_password (str): The plain-text password to verify.
+            hashed_password (str): The previously hashed password to compare against.
+
+        Returns:
+            bool: True if the plain password matches the hashed password, False otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _hash_executor, self.verify_password, plain_password, hashed_password
+        )
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Hashes a password like `get_password_hash`, without blocking the event loop.
+
+        Args:
+            password (str): The plain-text password to hash.
+
+        Returns:
+            str: The hashed password.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _hash_executor, self.get_password_hash, password
+        )
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Verified tokens of this worker process: token digest -> (exp, username, version, user)
+token_cache = TTLCache(
+    maxsize=config.TOKEN_CACHE_MAXSIZE, ttl=config.TOKEN_CACHE_TTL_SECONDS
+)
+
+# Decoded access token payloads of this worker process: token digest -> payload
+payload_cache = TTLCache(
+    maxsize=config.TOKEN_CACHE_MAXSIZE, ttl=config.TOKEN_CACHE_TTL_SECONDS
+)
+
+
+def _decode_token(token: str) -> dict:
+    """
+    Verifies a token and its claims in a single `jwt.decode` call.
+
+    The "exp" and "sub" claims are required, so every payload that is returned has
+    an expiration time and a string subject, and callers do not inspect them again.
+
+    Args:
+        token (str): The JWT token.
+
+    Raises:
+        JWTError: If the token is invalid, expired or lacks a required claim.
+
+    Returns:
+        dict: The payload of the token.
+    """
+    return jwt.decode(
+        token,
+        config.JWT_SECRET,
+        algorithms=[config.JWT_ALGORITHM],
+        options={"require_exp": True, "require_sub": True},
+    )
+
+
+def _token_cache_key(token: str) -> bytes:
+    """
+    Returns a compact digest of a raw bearer token to be used as a `token_cache` key.
+
+    Args:
+        token (str): The JWT access token.
+
+    Returns:
+        bytes: The 128-bit BLAKE2b digest of the token.
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verifies an access token and returns its payload, reusing recently decoded tokens.
+
+    A client sends the same token with every request, so the signature check is done
+    once per token and `payload_cache` serves the following requests until the token
+    expires or drops out of the cache.
+
+    Args:
+        token (str): The JWT access token.
+
+    Raises:
+        JWTError: If the token is invalid, expired or lacks the "exp" or "sub" claim.
+
+    Returns:
+        dict: The payload of the token.
+    """
+    cache_key = _token_cache_key(token)
+    payload = payload_cache.get(cache_key)
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+
+    payload = _decode_token(token)
+    payload_cache.set(cache_key, payload)
+    return payload
+
 
 def create_access_token(data: dict, expires_delta: Optional[int] = None) -> str:
     """
@@ -65,11 +210,9 @@ def create_access_token(data: dict, expires_delta: Optional[int] = None) -> str:
         str: The encoded JWT token.
     """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(UTC) + timedelta(seconds=expires_delta)
-    else:
-        expire = datetime.now(UTC) + timedelta(seconds=config.JWT_EXPIRATION_SECONDS)
-    to_encode.update({"exp": expire})
+    to_encode["exp"] = int(time.time()) + (
+        expires_delta or config.JWT_EXPIRATION_SECONDS
+    )
     encoded_jwt = jwt.encode(
         to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM
     )
@@ -78,15 +221,19 @@ def create_access_token(data: dict, expires_delta: Optional[int] = None) -> str:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_ro_db),
     redis: Redis = Depends(get_redis),
 ) -> User:
     """
     Retrieves the currently authenticated user based on the provided JWT token.
 
+    Tokens that were already verified by this process are served from `token_cache`,
+    skipping the signature check and the user lookup, as long as the token has not
+    expired and the user's version in Redis has not changed since.
+
     Args:
         token (str): The JWT access token extracted from the Authorization header.
-        db (AsyncSession): The database session dependency.
+        db (AsyncSession): The read-only database session dependency.
         redis (Redis): The redis connection
 
     Raises:
@@ -101,20 +248,29 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    user_cache_service = UserCacheService(redis)
+
+    cache_key = _token_cache_key(token)
+    cached = token_cache.get(cache_key)
+    if cached:
+        exp, username, version, user = cached
+        if (
+            exp > time.time()
+            and await user_cache_service.get_user_version(username) == version
+        ):
+            return user
+        token_cache.pop(cache_key)
+
     try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
-        username = payload["sub"]
-        if username is None:
-            raise credentials_exception
+        payload = decode_access_token(token)
     except JWTError as e:
         raise credentials_exception
+    username = payload["sub"]
 
-    # Отримаємо користувача з кешу
-    user_cache_service = UserCacheService(redis)
-    user = user_cache_service.get_user_from_cache(username)
+    # Отримаємо користувача з кешу разом з версією його даних
+    user, version = await user_cache_service.get_user_and_version(username)
     if user:
+        token_cache.set(cache_key, (payload["exp"], username, version, user))
         return user
 
     # Отримаємо користувача з бази даних
@@ -124,11 +280,52 @@ async def get_current_user(
         raise credentials_exception
 
     # Збережемо користувача у кеш
-    user_cache_service.set_user_to_cache(user)
+    await user_cache_service.set_user_to_cache(user)
+    token_cache.set(cache_key, (payload["exp"], username, version, user))
 
     return user
 
 
+async def get_current_user_id(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_ro_db),
+    redis: Redis = Depends(get_redis),
+) -> int:
+    """
+    Retrieves the ID of the currently authenticated user straight from the JWT token.
+
+    Access tokens carry the user's ID in the "uid" claim, so only the signature is
+    verified and the user is not loaded. Tokens issued without the claim fall back
+    to `get_current_user`.
+
+    Args:
+        token (str): The JWT access token extracted from the Authorization header.
+        db (AsyncSession): The read-only database session dependency.
+        redis (Redis): The redis connection
+
+    Raises:
+        HTTPException: If the credentials are invalid or the token cannot be validated.
+
+    Returns:
+        int: The ID of the user the token was issued to.
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id = payload.get("uid")
+    if user_id is not None:
+        return int(user_id)
+
+    user = await get_current_user(token, db, redis)
+    return user.id
+
+
 def get_current_admin_user(current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Недостатньо прав доступу")
@@ -145,9 +342,9 @@ def create_email_token(data: dict) -> str:
     Returns:
         str: The encoded JWT token with an expiration of 7 days.
     """
+    now = int(time.time())
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=7)
-    to_encode.update({"iat": datetime.now(timezone.utc), "exp": expire})
+    to_encode.update({"iat": now, "exp": now + EMAIL_TOKEN_EXPIRATION_SECONDS})
     token = jwt.encode(to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
     return token
 
@@ -166,9 +363,7 @@ async def get_email_from_token(token: str) -> str:
         str: The email address contained in the token.
     """
     try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
+        payload = _decode_token(token)
         email = payload["sub"]
         return email
     except JWTError as e:
@@ -214,9 +409,7 @@ async def get_email_and_password_from_token(token: str) -> dict:
               {"email": <email>, "password": <hashed_password>}
     """
     try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
+        payload = _decode_token(token)
         email = payload["sub"]
         password = payload["password"]
         return {"email": email, "password": password}
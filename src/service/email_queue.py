@@ -0,0 +1,177 @@
+import asyncio
+import json
+import logging
+
+from pydantic import EmailStr
+from redis.asyncio import Redis
+
+from src.cache.redis_cache import get_redis
+from src.service.email import send_email, send_reset_password_email
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUE = "queue:emails"
+# Jobs taken by the worker stay here until they are finished
+EMAIL_PROCESSING_QUEUE = "queue:emails:processing"
+
+EMAIL_TASKS = {
+    "send_email": send_email,
+    "send_reset_password_email": send_reset_password_email,
+}
+
+
+class EmailQueue:
+    """
+    A persistent email queue stored in a Redis list.
+
+    The API only pushes jobs to the queue, and a separate worker process started with
+    `python -m src.service.email_queue` sends them. A slow mail server therefore never
+    holds up an API worker, and jobs that are not sent yet survive API restarts.
+
+    The worker moves each job to a processing list with BLMOVE and removes it from
+    there only after the job is finished, so a job whose worker crashed is not lost:
+    it is put back to the queue when the worker starts again. Jobs are delivered at
+    least once. The processing list is shared, so run a single worker.
+    """
+
+    def __init__(self, redis_client: Redis, max_attempts: int = 3):
+        """
+        Initializes the EmailQueue with a Redis connection.
+
+        Args:
+            redis_client (Redis): The redis connection.
+            max_attempts (int): How many times a failing job is tried before it is dropped.
+        """
+        self.redis = redis_client
+        self.max_attempts = max_attempts
+
+    async def enqueue(self, task: str, attempts: int = 0, **kwargs):
+        """
+        Pushes a job to the end of the queue.
+
+        Args:
+            task (str): The name of the task in EMAIL_TASKS.
+            attempts (int): The number of times the job has already failed.
+            **kwargs: The keyword arguments of the task. They must be JSON serializable.
+        """
+        job = {"task": task, "kwargs": kwargs, "attempts": attempts}
+        await self.redis.rpush(EMAIL_QUEUE, json.dumps(job))
+
+    async def enqueue_verification_email(
+        self, email: EmailStr, username: str, host: str
+    ):
+        """
+        Queues a verification email.
+
+        Args:
+            email (EmailStr): The recipient's email address.
+            username (str): The username of the recipient.
+            host (str): The host URL of the application.
+        """
+        await self.enqueue("send_email", email=email, username=username, host=str(host))
+
+    async def enqueue_reset_password_email(
+        self, email: EmailStr, username: str, hashed_password: str, host: str
+    ):
+        """
+        Queues a reset password email.
+
+        Args:
+            email (EmailStr): The recipient's email address.
+            username (str): The username of the recipient.
+            hashed_password (str): The new hashed password to put into the reset token.
+            host (str): The host URL of the application.
+        """
+        await self.enqueue(
+            "send_reset_password_email",
+            email=email,
+            username=username,
+            hashed_password=hashed_password,
+            host=str(host),
+        )
+
+    async def process_job(self, raw_job: str | bytes):
+        """
+        Runs a single job taken from the queue. A job that fails is queued again until it reaches max_attempts.
+
+        A job that cannot be decoded, or names an unknown task, would fail the same way
+        on every attempt, so it is logged and dropped.
+
+        Args:
+            raw_job (str | bytes): The JSON encoded job.
+        """
+        try:
+            job = json.loads(raw_job)
+            task = EMAIL_TASKS[job["task"]]
+            kwargs = job["kwargs"]
+            attempts = job["attempts"] + 1
+        except (ValueError, TypeError, KeyError) as e:
+            logger.error("Dropping malformed email job %r: %r", raw_job, e)
+            return
+        try:
+            await task(**kwargs)
+        except Exception as e:
+            logger.exception(e)
+            if attempts < self.max_attempts:
+                await self.enqueue(job["task"], attempts=attempts, **kwargs)
+
+    async def requeue_unfinished(self) -> int:
+        """
+        Puts the jobs left in the processing list by a stopped worker back to the queue.
+
+        Returns:
+            int: The number of jobs put back.
+        """
+        count = 0
+        while await self.redis.lmove(
+            EMAIL_PROCESSING_QUEUE, EMAIL_QUEUE, "RIGHT", "LEFT"
+        ):
+            count += 1
+        return count
+
+    async def work_once(self, timeout: int = 5) -> bool:
+        """
+        Waits for a job, runs it and then removes it from the processing list.
+
+        Args:
+            timeout (int): The number of seconds to wait for a job.
+
+        Returns:
+            bool: True if a job was taken from the queue, False if the wait timed out.
+        """
+        raw_job = await self.redis.blmove(
+            EMAIL_QUEUE, EMAIL_PROCESSING_QUEUE, timeout, "LEFT", "RIGHT"
+        )
+        if raw_job is None:
+            return False
+        await self.process_job(raw_job)
+        await self.redis.lrem(EMAIL_PROCESSING_QUEUE, 1, raw_job)
+        return True
+
+    async def run_worker(self, timeout: int = 5):
+        """
+        Takes jobs from the queue and runs them until the process is stopped.
+
+        Args:
+            timeout (int): The number of seconds to wait for a job in a single BLMOVE call.
+        """
+        requeued = await self.requeue_unfinished()
+        if requeued:
+            logger.warning("Put %d unfinished email jobs back to the queue", requeued)
+        while True:
+            await self.work_once(timeout)
+
+
+def main():
+    """
+    Run the email worker.
+
+    Returns:
+        None
+    """
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(EmailQueue(get_redis()).run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import hashlib
+import time
+
 import cloudinary
-import cloudinary.uploader
+import httpx
 
 
 class UploadFileService:
@@ -7,6 +10,9 @@ class UploadFileService:
         """
         Initializes the UploadFileService with the given Cloudinary credentials.
 
+        The credentials are kept on the instance and passed with each call, so the
+        global `cloudinary.config` is not changed.
+
         Args:
             cloud_name (str): The name of the Cloudinary cloud.
             api_key (str): The API key for Cloudinary.
@@ -15,28 +21,64 @@ class UploadFileService:
         self.cloud_name = cloud_name
         self.api_key = api_key
         self.api_secret = api_secret
-        cloudinary.config(
-            cloud_name=self.cloud_name,
-            api_key=self.api_key,
-            api_secret=self.api_secret,
-            secure=True,
-        )
 
-    @staticmethod
-    def upload_file(file, username: str) -> str:
+    @property
+    def upload_url(self) -> str:
+        """
+        str: The Cloudinary REST endpoint for image uploads.
+        """
+        return f"https://api.cloudinary.com/v1_1/{self.cloud_name}/image/upload"
+
+    def sign(self, params: dict) -> str:
+        """
+        Signs upload parameters as required by the Cloudinary upload API.
+
+        Args:
+            params (dict): The upload parameters to sign, excluding the file and the API key.
+
+        Returns:
+            str: The SHA-1 signature of the sorted parameters and the API secret.
+        """
+        to_sign = "&".join(f"{key}={params[key]}" for key in sorted(params))
+        return hashlib.sha1(f"{to_sign}{self.api_secret}".encode()).hexdigest()
+
+    async def upload_file(self, file, username: str) -> str:
         """
         Uploads a given file to Cloudinary and returns the URL of the uploaded image.
 
+        The file is posted straight to the Cloudinary REST API with an async HTTP client,
+        so the event loop is free while the upload is in progress.
+
         Args:
-            file: The file-like object to be uploaded.
+            file: The uploaded file (UploadFile) to send.
             username (str): The username to associate with the uploaded file, used in the public ID.
 
         Returns:
             str: The URL of the uploaded and transformed image.
         """
         public_id = f"RestApp/{username}"
-        r = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
+        params = {
+            "overwrite": "true",
+            "public_id": public_id,
+            "timestamp": str(int(time.time())),
+        }
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(
+                self.upload_url,
+                data={
+                    **params,
+                    "api_key": str(self.api_key),
+                    "signature": self.sign(params),
+                },
+                files={"file": (file.filename, file.file, file.content_type)},
+            )
+        response.raise_for_status()
         src_url = cloudinary.CloudinaryImage(public_id).build_url(
-            width=250, height=250, crop="fill", version=r.get("version")
+            width=250,
+            height=250,
+            crop="fill",
+            version=response.json().get("version"),
+            cloud_name=self.cloud_name,
+            secure=True,
         )
         return src_url
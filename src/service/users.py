@@ -1,6 +1,6 @@
-from libgravatar import Gravatar
+import hashlib
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from watchfiles import awatch
 
 from src.database.models import User
 from src.repository.users import UserRepository
@@ -27,14 +27,49 @@ class UserService:
         Returns:
             User: The newly created user instance.
         """
-        avatar = None
-        try:
-            g = Gravatar(body.email)
-            avatar = g.get_image()
-        except Exception as e:
-            print(e)
+        return await self.repository.create_user(body, self._get_avatar(body))
+
+    @staticmethod
+    def _get_avatar(body: UserCreate) -> str:
+        """
+        Builds the Gravatar URL for the new user's email.
 
-        return await self.repository.create_user(body, avatar)
+        The URL only depends on the MD5 hash of the normalized email, so it is built
+        locally without contacting Gravatar.
+
+        Args:
+            body (UserCreate): The data for the new user.
+
+        Returns:
+            str: The avatar URL.
+        """
+        email_hash = hashlib.md5(body.email.strip().lower().encode()).hexdigest()
+        return f"https://www.gravatar.com/avatar/{email_hash}"
+
+    async def create_user_if_absent(self, body: UserCreate):
+        """
+        Creates a new user with a Gravatar avatar, unless the email or username is already taken.
+
+        Args:
+            body (UserCreate): The data for the new user.
+
+        Returns:
+            Optional[User]: The newly created user instance, or None if the email or username is already in use.
+        """
+        return await self.repository.create_user_if_absent(body, self._get_avatar(body))
+
+    async def get_user_by_email_or_username(self, email: str, username: str):
+        """
+        Retrieves a user that has the given email or the given username.
+
+        Args:
+            email (str): The email to look for.
+            username (str): The username to look for.
+
+        Returns:
+            Optional[User]: A matching user if found, otherwise None.
+        """
+        return await self.repository.get_user_by_email_or_username(email, username)
 
     async def get_user_by_id(self, user_id: int):
         """
@@ -72,7 +107,7 @@ class UserService:
         """
         return await self.repository.get_user_by_email(email)
 
-    async def confirmed_email(self, email: str):
+    async def confirmed_email(self, email: str) -> str | None:
         """
         Updates the user's email to a confirmed state.
 
@@ -80,7 +115,7 @@ class UserService:
             email (str): The email address to confirm.
 
         Returns:
-            Optional[User]: The updated user if the operation was successful, otherwise None.
+            str | None: The username of the confirmed user, None if the user does not exist or is already confirmed.
         """
         return await self.repository.confirmed_email(email)
 
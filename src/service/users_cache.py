@@ -1,23 +1,24 @@
-import json
-
-from redis import Redis
+from pydantic_core import from_json, to_json
+from redis.asyncio import Redis
 
 from src.database.models import User
 
 
 class UserCacheService:
-    def __init__(self, redis_client: Redis, ttl: int = 5 * 60):
+    def __init__(self, redis_client: Redis, ttl: int = 5 * 60, missing_ttl: int = 30):
         """
         Ініціалізація сервісу кешування користувача.
 
         Args:
             redis_client: Підключення до Redis.
             ttl (int): Час життя кешу в секундах.
+            missing_ttl (int): Час життя позначки про відсутнього користувача в секундах.
         """
         self.redis = redis_client
         self.ttl = ttl
+        self.missing_ttl = missing_ttl
 
-    def get_user_from_cache(self, username: str) -> User | None:
+    async def get_user_from_cache(self, username: str) -> User | None:
         """
         Отримати дані користувача з кешу по username.
 
@@ -27,16 +28,104 @@ class UserCacheService:
         Returns:
             User | None: Об'єкт користувача або None, якщо в кеші нема даних.
         """
-        user_data = self.redis.get(f"user:{username}")
+        user_data = await self.redis.get(f"user:{username}")
         if user_data:
-            return User.from_dict(json.loads(user_data))
+            return User.from_dict(from_json(user_data))
         return None
 
-    def set_user_to_cache(self, user: User):
+    async def set_user_to_cache(self, user: User):
         """
         Зберегти дані користувача у кеш.
 
         Args:
             user (User): Об'єкт користувача для кешування.
         """
-        self.redis.set(f"user:{user.username}", json.dumps(user.to_dict()), ex=self.ttl)
+        await self.redis.set(
+            f"user:{user.username}", to_json(user.to_dict()), ex=self.ttl
+        )
+
+    async def get_user_version(self, username: str) -> str | bytes | None:
+        """
+        Отримати версію даних користувача.
+
+        Версія змінюється щоразу, коли дані користувача оновлюються, і дозволяє
+        скинути кеші в пам'яті процесів, що зберігають старий стан.
+
+        Args:
+            username (str): Ім'я користувача.
+
+        Returns:
+            str | bytes | None: Поточна версія або None, якщо дані ще не змінювались.
+        """
+        return await self.redis.get(f"user_version:{username}")
+
+    async def get_user_and_version(
+        self, username: str
+    ) -> tuple[User | None, str | bytes | None]:
+        """
+        Отримати користувача з кешу разом з версією його даних одним запитом MGET.
+
+        Args:
+            username (str): Ім'я користувача.
+
+        Returns:
+            tuple[User | None, str | bytes | None]: Об'єкт користувача або None, якщо в
+            кеші нема даних, та поточна версія або None, якщо дані ще не змінювались.
+        """
+        user_data, version = await self.redis.mget(
+            f"user:{username}", f"user_version:{username}"
+        )
+        user = User.from_dict(from_json(user_data)) if user_data else None
+        return user, version
+
+    async def bump_user_version(self, username: str):
+        """
+        Змінити версію даних користувача та видалити його з кешу.
+
+        Обидві команди надсилаються одним конвеєром в транзакції.
+
+        Args:
+            username (str): Ім'я користувача.
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(f"user_version:{username}")
+            pipe.delete(f"user:{username}")
+            await pipe.execute()
+
+    async def is_missing(self, field: str, value: str) -> bool:
+        """
+        Перевірити, чи недавно з'ясувалося, що користувача з таким значенням немає.
+
+        Негативний кеш захищає базу даних від повторних пошуків неіснуючих
+        користувачів, наприклад під час підбору облікових даних.
+
+        Args:
+            field (str): Поле пошуку, "email" або "username".
+            value (str): Значення поля.
+
+        Returns:
+            bool: True, якщо користувача немає за даними кешу.
+        """
+        return bool(await self.redis.exists(f"noexist:{field}:{value}"))
+
+    async def set_missing(self, field: str, value: str):
+        """
+        Запам'ятати, що користувача з таким значенням немає.
+
+        Args:
+            field (str): Поле пошуку, "email" або "username".
+            value (str): Значення поля.
+        """
+        await self.redis.set(f"noexist:{field}:{value}", 1, ex=self.missing_ttl)
+
+    async def clear_missing(self, email: str, username: str):
+        """
+        Видалити позначки про відсутність для щойно створеного користувача.
+
+        Args:
+            email (str): Email користувача.
+            username (str): Ім'я користувача.
+        """
+        await self.redis.delete(
+            f"noexist:email:{email}", f"noexist:username:{username}"
+        )
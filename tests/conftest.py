@@ -1,4 +1,6 @@
 import asyncio
+import os
+from unittest.mock import AsyncMock, Mock
 
 import fakeredis
 import pytest
@@ -7,13 +9,22 @@ from fastapi.testclient import TestClient
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
+# Keep the rate limit counters in memory, so each test can start from zero
+os.environ.setdefault("RATE_LIMIT_STORAGE_URI", "memory://")
+
 from main import app
+from src.api.limiter import limiter
 from src.cache.redis_cache import get_redis
+from src.conf.config import config
 from src.database.models import Base, User
-from src.database.db import get_db
-from src.service.auth import create_access_token, Hash
+from src.database.db import get_db, get_ro_db
+from src.service.auth import create_access_token, Hash, payload_cache, token_cache
+
+# StaticPool keeps the single connection, and with it the in-memory database, alive
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+# The minimum bcrypt cost factor keeps password hashing in tests fast
+config.BCRYPT_ROUNDS = 4
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -32,6 +43,9 @@ test_user = {
     "avatar": "https://twitter.com/gravatar",
 }
 
+# Hashed once for the whole run and reused by every module's database setup
+test_user_hashed_password = Hash().get_password_hash(test_user["password"])
+
 
 @pytest.fixture(scope="module", autouse=True)
 def init_models_wrap():
@@ -40,11 +54,10 @@ def init_models_wrap():
             await conn.run_sync(Base.metadata.drop_all)
             await conn.run_sync(Base.metadata.create_all)
         async with TestingSessionLocal() as session:
-            hash_password = Hash().get_password_hash(test_user["password"])
             current_user = User(
                 username=test_user["username"],
                 email=test_user["email"],
-                hashed_password=hash_password,
+                hashed_password=test_user_hashed_password,
                 is_confirmed=True,
                 avatar=test_user["avatar"],
             )
@@ -54,7 +67,27 @@ def init_models_wrap():
     asyncio.run(init_models())
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def mock_email_queue(monkeypatch):
+    # No test may push jobs to a real Redis queue
+    mock_email_queue = Mock(return_value=AsyncMock())
+    monkeypatch.setattr("src.api.auth.EmailQueue", mock_email_queue)
+    return mock_email_queue
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    # Tests change users directly in the database, bypassing cache invalidation
+    token_cache.clear()
+    payload_cache.clear()
+
+
+@pytest.fixture(scope="session")
 def client():
     # Dependency override
 
@@ -67,17 +100,23 @@ def client():
                 raise
 
     def override_get_redis():
-        return fakeredis.FakeRedis(decode_responses=True)
+        return fakeredis.FakeAsyncRedis(decode_responses=True)
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_ro_db] = override_get_db
     app.dependency_overrides[get_redis] = override_get_redis
 
-    yield TestClient(app)
+    # Entering the client starts one event loop thread for the whole session,
+    # instead of a new one for every request
+    with TestClient(app) as test_client:
+        yield test_client
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def get_token():
-    token = create_access_token(data={"sub": test_user["username"]})
+    token = create_access_token(
+        data={"sub": test_user["username"]}, expires_delta=24 * 60 * 60
+    )
     return token
 
 
@@ -0,0 +1,107 @@
+import bcrypt
+import pytest
+from fastapi import HTTPException
+from jose import JWTError, jwt
+from unittest.mock import patch
+
+from src.conf.config import config
+from src.service.auth import (
+    create_access_token,
+    decode_access_token,
+    get_email_from_token,
+    Hash,
+)
+
+
+def test_decode_access_token():
+    token = create_access_token(data={"sub": "testuser", "uid": 1})
+
+    payload = decode_access_token(token)
+
+    assert payload["sub"] == "testuser"
+    assert payload["uid"] == 1
+
+
+def test_decode_access_token_reuses_payload():
+    token = create_access_token(data={"sub": "testuser"})
+
+    with patch("src.service.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+        first = decode_access_token(token)
+        second = decode_access_token(token)
+
+    assert first == second
+    mock_decode.assert_called_once()
+
+
+def test_decode_access_token_expired():
+    token = create_access_token(data={"sub": "testuser"}, expires_delta=-1)
+
+    with pytest.raises(JWTError):
+        decode_access_token(token)
+
+
+def test_decode_access_token_requires_sub():
+    token = create_access_token(data={"uid": 1})
+
+    with pytest.raises(JWTError):
+        decode_access_token(token)
+
+
+def test_decode_access_token_requires_exp():
+    token = jwt.encode(
+        {"sub": "testuser"}, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM
+    )
+
+    with pytest.raises(JWTError):
+        decode_access_token(token)
+
+
+@pytest.mark.asyncio
+async def test_get_email_from_token_requires_sub():
+    token = create_access_token(data={"email": "test@example.com"})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_email_from_token(token)
+
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_password_hash_async():
+    hashed_password = await Hash().get_password_hash_async("12345678")
+
+    assert await Hash().verify_password_async("12345678", hashed_password)
+    assert not await Hash().verify_password_async("wrong_password", hashed_password)
+
+
+def test_verify_password_uses_bcrypt_checkpw():
+    # bcrypt.checkpw compares the hashes in constant time
+    hashed_password = Hash().get_password_hash("12345678")
+
+    with patch("src.service.auth.bcrypt.checkpw", wraps=bcrypt.checkpw) as mock_checkpw:
+        assert Hash().verify_password("12345678", hashed_password)
+
+    mock_checkpw.assert_called_once_with(b"12345678", hashed_password.encode())
+
+
+def test_needs_rehash(monkeypatch):
+    monkeypatch.setattr("src.service.auth.config.BCRYPT_ROUNDS", 4)
+    hashed_password = Hash().get_password_hash("12345678")
+
+    assert not Hash().needs_rehash(hashed_password)
+
+    monkeypatch.setattr("src.service.auth.config.BCRYPT_ROUNDS", 5)
+    assert Hash().needs_rehash(hashed_password)
+    assert Hash().needs_rehash("not-a-bcrypt-hash")
+
+    monkeypatch.setattr("src.service.auth.config.BCRYPT_ROUNDS", 4)
+    stronger_hash = bcrypt.hashpw(b"12345678", bcrypt.gensalt(rounds=5)).decode()
+    assert not Hash().needs_rehash(stronger_hash)
+
+
+def test_create_access_token_expiration():
+    with patch("src.service.auth.time.time", return_value=1_000_000.5):
+        token = create_access_token(data={"sub": "testuser"}, expires_delta=60)
+
+    claims = jwt.get_unverified_claims(token)
+    assert claims["exp"] == 1_000_060
@@ -36,9 +36,14 @@ async def test_create_contact(contact_repository, mock_session, user):
         birthday=date(1990, 1, 1),
         comment="Friend from college",
     )
+    mock_result = MagicMock()
+    mock_result.scalar_one.return_value = Contact(
+        id=1, **contact_data.model_dump(), user_id=user.id
+    )
+    mock_session.execute.return_value = mock_result
 
     # Call method
-    result = await contact_repository.create_contact(body=contact_data, user=user)
+    result = await contact_repository.create_contact(body=contact_data, user_id=user.id)
 
     # Assertions
     assert isinstance(result, Contact)
@@ -50,9 +55,47 @@ async def test_create_contact(contact_repository, mock_session, user):
     assert result.comment == "Friend from college"
     assert result.user_id == user.id
 
-    mock_session.add.assert_called_once()
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_contacts(contact_repository, mock_session, user):
+    # Setup
+    contacts_data = [
+        ContactModel(
+            firstname=firstname,
+            lastname="Doe",
+            email=f"{firstname.lower()}doe@example.com",
+            phone="1234567890",
+            birthday=date(1990, 1, 1),
+        )
+        for firstname in ("John", "Jane")
+    ]
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        Contact(id=i, **body.model_dump(), user_id=user.id)
+        for i, body in enumerate(contacts_data, start=1)
+    ]
+    mock_session.scalars.return_value = mock_result
+
+    # Call method
+    result = await contact_repository.create_contacts(contacts_data, user_id=user.id)
+
+    # Assertions
+    assert [contact.firstname for contact in result] == ["John", "Jane"]
+    stmt, rows = mock_session.scalars.await_args.args
+    assert [row["user_id"] for row in rows] == [user.id, user.id]
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+
+
+@pytest.mark.asyncio
+async def test_create_contacts_empty(contact_repository, mock_session, user):
+    result = await contact_repository.create_contacts([], user_id=user.id)
+
+    assert result == []
+    mock_session.scalars.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -63,10 +106,10 @@ async def test_read_contacts(contact_repository, mock_session, user):
         Contact(firstname="John", lastname="Doe", email="johndoe@example.com"),
         Contact(firstname="Jane", lastname="Doe", email="janedoe@example.com"),
     ]
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
-    contacts = await contact_repository.read_contacts(user=user)
+    contacts = await contact_repository.read_contacts(user_id=user.id)
 
     # Assertions
     assert len(contacts) == 2
@@ -79,10 +122,10 @@ async def test_read_contact(contact_repository, mock_session, user):
     mock_result.scalar_one_or_none.return_value = Contact(
         firstname="John", lastname="Doe", email="johndoe@example.com"
     )
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
-    result = await contact_repository.read_contact(contact_id=1, user=user)
+    result = await contact_repository.read_contact(contact_id=1, user_id=user.id)
 
     # Assertions
     assert result is not None
@@ -101,22 +144,14 @@ async def test_update_contact(contact_repository, mock_session, user):
         birthday=date(1990, 1, 1),
         comment="Friend from college",
     )
-    existing_contact = Contact(
-        id=1,
-        firstname="Colin",
-        lastname="Farrel",
-        email="colinfarrel@example.com",
-        phone="9898989898",
-        birthday=date(1982, 1, 1),
-        comment="Some dude",
-    )
+    updated_contact = Contact(id=1, **contact_data.model_dump(), user_id=user.id)
     mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = existing_contact
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_result.scalar_one_or_none.return_value = updated_contact
+    mock_session.execute.return_value = mock_result
 
     # Call method
     result = await contact_repository.update_contact(
-        contact_id=1, body=contact_data, user=user
+        contact_id=1, body=contact_data, user_id=user.id
     )
 
     # Assertions
@@ -126,8 +161,9 @@ async def test_update_contact(contact_repository, mock_session, user):
     assert result.phone == "1234567890"
     assert result.birthday == date(1990, 1, 1)
     assert result.comment == "Friend from college"
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(existing_contact)
+    mock_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -140,15 +176,15 @@ async def test_delete_contact(contact_repository, mock_session, user):
     )
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = existing_contact
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
-    result = await contact_repository.delete_contact(contact_id=1, user=user)
+    result = await contact_repository.delete_contact(contact_id=1, user_id=user.id)
 
     # Assertions
     assert result is not None
     assert result.id == 1
     assert result.firstname == "Colin"
     assert result.lastname == "Farrel"
-    mock_session.delete.assert_awaited_once_with(existing_contact)
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
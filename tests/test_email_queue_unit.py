@@ -0,0 +1,178 @@
+import json
+
+import fakeredis
+import pytest
+from fastapi_mail.errors import ConnectionErrors
+from unittest.mock import AsyncMock, Mock
+
+from src.service.email_queue import (
+    EMAIL_PROCESSING_QUEUE,
+    EMAIL_QUEUE,
+    EMAIL_TASKS,
+    EmailQueue,
+)
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture
+def email_queue(redis_client):
+    return EmailQueue(redis_client, max_attempts=2)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_verification_email(email_queue, redis_client):
+    # Call method
+    await email_queue.enqueue_verification_email(
+        "test@example.com", "testuser", "http://testserver/"
+    )
+
+    # Assertions
+    job = json.loads(await redis_client.lpop(EMAIL_QUEUE))
+    assert job == {
+        "task": "send_email",
+        "kwargs": {
+            "email": "test@example.com",
+            "username": "testuser",
+            "host": "http://testserver/",
+        },
+        "attempts": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_enqueue_reset_password_email(email_queue, redis_client):
+    # Call method
+    await email_queue.enqueue_reset_password_email(
+        "test@example.com", "testuser", "hashed_password", "http://testserver/"
+    )
+
+    # Assertions
+    job = json.loads(await redis_client.lpop(EMAIL_QUEUE))
+    assert job["task"] == "send_reset_password_email"
+    assert job["kwargs"]["hashed_password"] == "hashed_password"
+
+
+@pytest.mark.asyncio
+async def test_process_job(email_queue, redis_client, monkeypatch):
+    # Setup
+    mock_send_email = AsyncMock()
+    monkeypatch.setitem(EMAIL_TASKS, "send_email", mock_send_email)
+    await email_queue.enqueue_verification_email("test@example.com", "testuser", "host")
+
+    # Call method
+    await email_queue.process_job(await redis_client.lpop(EMAIL_QUEUE))
+
+    # Assertions
+    mock_send_email.assert_awaited_once_with(
+        email="test@example.com", username="testuser", host="host"
+    )
+    assert await redis_client.llen(EMAIL_QUEUE) == 0
+
+
+@pytest.mark.asyncio
+async def test_process_job_retries_until_max_attempts(
+    email_queue, redis_client, monkeypatch
+):
+    # Setup
+    mock_send_email = AsyncMock(side_effect=RuntimeError("SMTP is down"))
+    monkeypatch.setitem(EMAIL_TASKS, "send_email", mock_send_email)
+    await email_queue.enqueue_verification_email("test@example.com", "testuser", "host")
+
+    # Call method
+    await email_queue.process_job(await redis_client.lpop(EMAIL_QUEUE))
+
+    # Assertions
+    job = await redis_client.lpop(EMAIL_QUEUE)
+    assert json.loads(job)["attempts"] == 1
+
+    await email_queue.process_job(job)
+    assert await redis_client.llen(EMAIL_QUEUE) == 0
+    assert mock_send_email.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "raw_job",
+    [
+        b"not json",
+        b"[]",
+        json.dumps({"task": "unknown_task", "kwargs": {}, "attempts": 0}),
+        json.dumps({"task": "send_email", "kwargs": {}}),
+    ],
+)
+async def test_work_once_drops_malformed_job(email_queue, redis_client, raw_job):
+    # Setup
+    await redis_client.rpush(EMAIL_QUEUE, raw_job)
+
+    # Call method
+    assert await email_queue.work_once(timeout=1)
+
+    # Assertions
+    assert await redis_client.llen(EMAIL_QUEUE) == 0
+    assert await redis_client.llen(EMAIL_PROCESSING_QUEUE) == 0
+
+
+@pytest.mark.asyncio
+async def test_smtp_connection_error_requeues_job(
+    email_queue, redis_client, monkeypatch
+):
+    # Setup
+    mock_send_message = AsyncMock(side_effect=ConnectionErrors("SMTP is down"))
+    monkeypatch.setattr(
+        "src.service.email.get_mail", lambda: Mock(send_message=mock_send_message)
+    )
+    await email_queue.enqueue_verification_email(
+        "test@example.com", "testuser", "http://testserver/"
+    )
+
+    # Call method
+    await email_queue.process_job(await redis_client.lpop(EMAIL_QUEUE))
+
+    # Assertions
+    mock_send_message.assert_awaited_once()
+    job = json.loads(await redis_client.lpop(EMAIL_QUEUE))
+    assert job["task"] == "send_email"
+    assert job["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_work_once(email_queue, redis_client, monkeypatch):
+    # Setup
+    mock_send_email = AsyncMock()
+    monkeypatch.setitem(EMAIL_TASKS, "send_email", mock_send_email)
+    await email_queue.enqueue_verification_email("test@example.com", "testuser", "host")
+
+    # Call method
+    assert await email_queue.work_once(timeout=1)
+
+    # Assertions
+    mock_send_email.assert_awaited_once()
+    assert await redis_client.llen(EMAIL_QUEUE) == 0
+    assert await redis_client.llen(EMAIL_PROCESSING_QUEUE) == 0
+
+
+@pytest.mark.asyncio
+async def test_work_once_keeps_job_until_finished(
+    email_queue, redis_client, monkeypatch
+):
+    # Setup
+    async def crash(**kwargs):
+        assert await redis_client.llen(EMAIL_PROCESSING_QUEUE) == 1
+        raise KeyboardInterrupt
+
+    monkeypatch.setitem(EMAIL_TASKS, "send_email", crash)
+    await email_queue.enqueue_verification_email("test@example.com", "testuser", "host")
+
+    # Call method
+    with pytest.raises(KeyboardInterrupt):
+        await email_queue.work_once(timeout=1)
+
+    # Assertions
+    assert await redis_client.llen(EMAIL_QUEUE) == 0
+    assert await email_queue.requeue_unfinished() == 1
+    assert await redis_client.llen(EMAIL_QUEUE) == 1
+    assert await redis_client.llen(EMAIL_PROCESSING_QUEUE) == 0
@@ -1,6 +1,18 @@
-from unittest.mock import Mock
+import asyncio
+import hashlib
+from unittest.mock import AsyncMock
 
+import fakeredis
+import pytest
+from sqlalchemy import select
+
+from main import app
+from src.cache.redis_cache import get_redis
+from src.database.models import User
 from src.service.auth import create_email_token, create_reset_password_token, Hash
+from src.service.users_cache import UserCacheService
+
+from tests.conftest import TestingSessionLocal, test_user
 
 user_data = {
     "username": "agent007",
@@ -10,25 +22,51 @@ user_data = {
 }
 
 
-def test_signup(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+@pytest.fixture(scope="module")
+def email_confirm_token():
+    return create_email_token({"sub": user_data.get("email")})
+
+
+def test_signup(client, mock_email_queue):
     response = client.post("api/auth/register", json=user_data)
     assert response.status_code == 201, response.text
     data = response.json()
     assert data["username"] == user_data["username"]
     assert data["email"] == user_data["email"]
     assert "hashed_password" not in data
-    assert "avatar" in data
+    assert data["avatar"] == (
+        "https://www.gravatar.com/avatar/"
+        + hashlib.md5(user_data["email"].encode()).hexdigest()
+    )
+    mock_email_queue.return_value.enqueue_verification_email.assert_called_once()
 
 
 def test_repeat_signup(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+    mock_hash = AsyncMock()
+    monkeypatch.setattr("src.api.auth.Hash.get_password_hash_async", mock_hash)
     response = client.post("api/auth/register", json=user_data)
     assert response.status_code == 409, response.text
     data = response.json()
     assert data["detail"] == "Користувач з таким email вже існує"
+    mock_hash.assert_not_awaited()
+
+
+def test_repeat_signup_with_same_username(client):
+    response = client.post(
+        "api/auth/register", json={**user_data, "email": "other007@gmail.com"}
+    )
+    assert response.status_code == 409, response.text
+    data = response.json()
+    assert data["detail"] == "Користувач з таким іменем вже існує"
+
+
+def test_repeat_signup_with_email_and_username_of_different_users(client):
+    response = client.post(
+        "api/auth/register", json={**user_data, "username": test_user["username"]}
+    )
+    assert response.status_code == 409, response.text
+    data = response.json()
+    assert data["detail"] == "Користувач з таким email вже існує"
 
 
 def test_not_confirmed_login(client):
@@ -44,9 +82,7 @@ def test_not_confirmed_login(client):
     assert data["detail"] == "Електронна адреса не підтверджена"
 
 
-def test_request_email(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+def test_request_email(client):
     response = client.post(
         "api/auth/request_email", json={"email": user_data.get("email")}
     )
@@ -55,18 +91,15 @@ def test_request_email(client, monkeypatch):
     assert data["message"] == "Check your email for confirmation."
 
 
-def test_confirm_email(client):
-    token_verification = create_email_token({"sub": user_data.get("email")})
-    response = client.get(f"api/auth/confirmed_email/{token_verification}")
+def test_confirm_email(client, email_confirm_token):
+    response = client.get(f"api/auth/confirmed_email/{email_confirm_token}")
 
     assert response.status_code == 200, response.text
     data = response.json()
     assert data["message"] == "Your email has been confirmed."
 
 
-def test_confirmed_request_email(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+def test_confirmed_request_email(client):
     response = client.post(
         "api/auth/request_email", json={"email": user_data.get("email")}
     )
@@ -75,9 +108,8 @@ def test_confirmed_request_email(client, monkeypatch):
     assert data["message"] == "Your email has already been confirmed."
 
 
-def test_repeat_confirm_email(client):
-    token_verification = create_email_token({"sub": user_data.get("email")})
-    response = client.get(f"api/auth/confirmed_email/{token_verification}")
+def test_repeat_confirm_email(client, email_confirm_token):
+    response = client.get(f"api/auth/confirmed_email/{email_confirm_token}")
 
     assert response.status_code == 200, response.text
     data = response.json()
@@ -116,38 +148,75 @@ def test_login(client):
     assert "token_type" in data
 
 
-def test_wrong_password_login(client):
+def test_login_rehashes_password_with_new_cost(client, monkeypatch):
+    monkeypatch.setattr("src.service.auth.config.BCRYPT_ROUNDS", 5)
+
     response = client.post(
         "api/auth/login",
-        data={"username": user_data.get("username"), "password": "password"},
+        data={
+            "username": user_data.get("username"),
+            "password": user_data.get("password"),
+        },
     )
-    assert response.status_code == 401, response.text
-    data = response.json()
-    assert data["detail"] == "Неправильний логін або пароль"
+    assert response.status_code == 200, response.text
 
+    async def get_hashed_password():
+        async with TestingSessionLocal() as session:
+            result = await session.execute(
+                select(User.hashed_password).where(
+                    User.username == user_data.get("username")
+                )
+            )
+            return result.scalar_one()
 
-def test_wrong_username_login(client):
-    response = client.post(
-        "api/auth/login",
-        data={"username": "username", "password": user_data.get("password")},
-    )
-    assert response.status_code == 401, response.text
-    data = response.json()
-    assert data["detail"] == "Неправильний логін або пароль"
+    assert asyncio.run(get_hashed_password()).startswith("$2b$05$")
 
 
-def test_validation_error_login(client):
+def test_login_rehash_of_deleted_user(client, monkeypatch):
+    monkeypatch.setattr("src.service.auth.config.BCRYPT_ROUNDS", 6)
+    mock_reset_password = AsyncMock(return_value=None)
+    monkeypatch.setattr("src.api.auth.UserService.reset_password", mock_reset_password)
+
     response = client.post(
-        "api/auth/login", data={"password": user_data.get("password")}
+        "api/auth/login",
+        data={
+            "username": user_data.get("username"),
+            "password": user_data.get("password"),
+        },
     )
-    assert response.status_code == 422, response.text
+    assert response.status_code == 401, response.text
+    assert response.json()["detail"] == "Неправильний логін або пароль"
+    mock_reset_password.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "form_data, status_code, detail",
+    [
+        (
+            {"username": user_data.get("username"), "password": "password"},
+            401,
+            "Неправильний логін або пароль",
+        ),
+        (
+            {"username": "username", "password": user_data.get("password")},
+            401,
+            "Неправильний логін або пароль",
+        ),
+        ({"password": user_data.get("password")}, 422, None),
+    ],
+    ids=["wrong_password", "wrong_username", "validation_error"],
+)
+def test_login_failures(client, form_data, status_code, detail):
+    response = client.post("api/auth/login", data=form_data)
+    assert response.status_code == status_code, response.text
     data = response.json()
-    assert "detail" in data
+    if detail is None:
+        assert "detail" in data
+    else:
+        assert data["detail"] == detail
 
 
-def test_reset_password_request_with_unregistered_email(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+def test_reset_password_request_with_unregistered_email(client):
     response = client.post(
         "api/auth/reset_password",
         json={"email": "unknown@email.com", "password": "new_password"},
@@ -157,9 +226,7 @@ def test_reset_password_request_with_unregistered_email(client, monkeypatch):
     assert data["detail"] == "Your email is not registered"
 
 
-def test_reset_password_request(client, monkeypatch):
-    mock_send_email = Mock()
-    monkeypatch.setattr("src.api.auth.send_email", mock_send_email)
+def test_reset_password_request(client):
     response = client.post(
         "api/auth/reset_password",
         json={"email": user_data.get("email"), "password": "new_password"},
@@ -187,3 +254,84 @@ def test_confirm_reset_password(client):
         },
     )
     assert response.status_code == 200, response.text
+
+
+@pytest.fixture()
+def shared_redis(client):
+    # The default override hands out an empty Redis per request, share one instead
+    redis = fakeredis.FakeAsyncRedis(
+        server=fakeredis.FakeServer(), decode_responses=True
+    )
+    default_override = app.dependency_overrides[get_redis]
+    app.dependency_overrides[get_redis] = lambda: redis
+    yield redis
+    app.dependency_overrides[get_redis] = default_override
+
+
+def test_login_served_from_cache(client, shared_redis, monkeypatch):
+    credentials = {
+        "username": user_data.get("username"),
+        "password": "new_password_1233",
+    }
+    response = client.post("api/auth/login", data=credentials)
+    assert response.status_code == 200, response.text
+
+    mock_get_user = AsyncMock()
+    monkeypatch.setattr("src.api.auth.UserService.get_user_by_username", mock_get_user)
+    response = client.post("api/auth/login", data=credentials)
+    assert response.status_code == 200, response.text
+    mock_get_user.assert_not_awaited()
+
+
+def test_login_after_confirming_cached_user(client, shared_redis):
+    new_user = {**user_data, "username": "agent008", "email": "agent008@gmail.com"}
+    response = client.post("api/auth/register", json=new_user)
+    assert response.status_code == 201, response.text
+
+    async def cache_unconfirmed_user():
+        async with TestingSessionLocal() as session:
+            user = await session.scalar(
+                select(User).where(User.username == new_user["username"])
+            )
+        assert user.is_confirmed is False
+        await UserCacheService(shared_redis).set_user_to_cache(user)
+
+    asyncio.run(cache_unconfirmed_user())
+
+    token_verification = create_email_token({"sub": new_user["email"]})
+    response = client.get(f"api/auth/confirmed_email/{token_verification}")
+    assert response.status_code == 200, response.text
+
+    response = client.post(
+        "api/auth/login",
+        data={"username": new_user["username"], "password": new_user["password"]},
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_unknown_username_login_is_cached(client, shared_redis, monkeypatch):
+    credentials = {"username": "agent009", "password": user_data.get("password")}
+    response = client.post("api/auth/login", data=credentials)
+    assert response.status_code == 401, response.text
+
+    mock_get_user = AsyncMock()
+    monkeypatch.setattr("src.api.auth.UserService.get_user_by_username", mock_get_user)
+    response = client.post("api/auth/login", data=credentials)
+    assert response.status_code == 401, response.text
+    mock_get_user.assert_not_awaited()
+
+
+def test_register_clears_missing_user(client, shared_redis, mock_email_queue):
+    new_user = {**user_data, "username": "agent009", "email": "agent009@gmail.com"}
+    response = client.post("api/auth/request_email", json={"email": new_user["email"]})
+    assert response.status_code == 200, response.text
+
+    response = client.post("api/auth/register", json=new_user)
+    assert response.status_code == 201, response.text
+
+    response = client.post("api/auth/request_email", json={"email": new_user["email"]})
+    assert response.status_code == 200, response.text
+    mock_email_queue.return_value.enqueue_verification_email.assert_awaited()
+    assert not asyncio.run(
+        UserCacheService(shared_redis).is_missing("username", new_user["username"])
+    )
@@ -1,3 +1,8 @@
+from datetime import date, timedelta
+
+from src.service.auth import create_access_token
+
+
 def test_create_contact(client, get_token):
     response = client.post(
         "api/contacts",
@@ -38,6 +43,23 @@ def test_read_contact(client, get_token):
     assert data["comment"] is None
 
 
+def test_read_contact_not_modified(client, get_token):
+    response = client.get(
+        "api/contacts/1",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "api/contacts/1",
+        headers={"Authorization": f"Bearer {get_token}", "If-None-Match": etag},
+    )
+
+    assert response.status_code == 304, response.text
+    assert response.headers["ETag"] == etag
+
+
 def test_read_contact_not_found(client, get_token):
     response = client.get(
         "api/contacts/2",
@@ -61,6 +83,58 @@ def test_read_contacts(client, get_token):
     assert data[0]["firstname"] == "John"
 
 
+def test_read_contacts_with_user_id_claim(client):
+    token = create_access_token(data={"sub": "unknown", "uid": 1})
+    response = client.get(
+        "api/contacts",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert [contact["id"] for contact in response.json()] == [1]
+
+
+def test_read_contacts_filtered(client, get_token):
+    response = client.get(
+        "api/contacts",
+        params={"firstname": "joh", "email": "example.com"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [contact["id"] for contact in data] == [1]
+
+    response = client.get(
+        "api/contacts",
+        params={"lastname": "Smith"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == []
+
+    response = client.get(
+        "api/contacts",
+        params={"firstname": "%%"},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == []
+
+
+def test_read_contacts_after_id(client, get_token):
+    response = client.get(
+        "api/contacts",
+        params={"after_id": 1},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == []
+
+
 def test_update_contact(client, get_token):
     new_contact_data = {
         "firstname": "firstname2",
@@ -129,3 +203,33 @@ def test_repeat_delete_contact(client, get_token):
     assert response.status_code == 404, response.text
     data = response.json()
     assert data["detail"] == "Contact not found."
+
+
+def test_read_contacts_upcoming_birthday(client, get_token):
+    ids = {}
+    for name, days in (("Soon", 3), ("Later", 100)):
+        birthday = date.today() + timedelta(days=days)
+        response = client.post(
+            "/api/contacts",
+            json={
+                "firstname": name,
+                "lastname": "Birthday",
+                "email": f"{name.lower()}@example.com",
+                "phone": "1234567890",
+                "birthday": birthday.replace(year=2000).isoformat(),
+            },
+            headers={"Authorization": f"Bearer {get_token}"},
+        )
+        assert response.status_code == 201, response.text
+        ids[name] = response.json()["id"]
+
+    response = client.get(
+        "api/contacts",
+        params={"upcoming_birthday_days": 7},
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+
+    assert response.status_code == 200, response.text
+    found = [contact["id"] for contact in response.json()]
+    assert ids["Soon"] in found
+    assert ids["Later"] not in found
@@ -2,7 +2,14 @@ import pytest
 
 from src.database.models import User, UserRole
 from tests.conftest import TestingSessionLocal
-from sqlalchemy import select
+from sqlalchemy import update
+
+
+@pytest.fixture(scope="module")
+def avatar_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("avatars") / "avatar.jpg"
+    path.write_bytes(b"fake image content")
+    return path
 
 
 def test_me(client, get_token, test_user_data):
@@ -19,6 +26,24 @@ def test_me(client, get_token, test_user_data):
     assert "id" in data
 
 
+def test_me_not_modified(client, get_token):
+    response = client.get(
+        "api/users/me",
+        headers={"Authorization": f"Bearer {get_token}"},
+    )
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "api/users/me",
+        headers={"Authorization": f"Bearer {get_token}", "If-None-Match": etag},
+    )
+
+    assert response.status_code == 304, response.text
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
 def test_me_unauthenticated(client):
     response = client.get(
         "api/users/me",
@@ -28,12 +53,9 @@ def test_me_unauthenticated(client):
 
 
 def test_update_avatar_user_with_user_role(
-    client, get_token, tmp_path, mocker, test_user_data
+    client, get_token, avatar_file, mocker, test_user_data
 ):
-    test_file = tmp_path / "avatar.jpg"
-    test_file.write_bytes(b"fake image content")
-
-    with open(test_file, "rb") as f:
+    with open(avatar_file, "rb") as f:
         files = {"file": ("avatar.jpg", f, "image/jpeg")}
         response = client.patch(
             "api/users/avatar",
@@ -48,26 +70,22 @@ def test_update_avatar_user_with_user_role(
 
 @pytest.mark.asyncio
 async def test_update_avatar_user_with_admin_role(
-    client, get_token, tmp_path, mocker, test_user_data
+    client, get_token, avatar_file, mocker, test_user_data
 ):
     async with TestingSessionLocal() as session:
-        current_user = await session.execute(
-            select(User).where(User.email == test_user_data.get("email"))
+        await session.execute(
+            update(User)
+            .where(User.email == test_user_data.get("email"))
+            .values(role=UserRole.ADMIN)
         )
-        current_user = current_user.scalar_one_or_none()
-        if current_user:
-            current_user.role = UserRole.ADMIN
-            await session.commit()
+        await session.commit()
 
     mock_upload_file = mocker.patch(
         "src.service.upload_file.UploadFileService.upload_file"
     )
     mock_upload_file.return_value = "http://example.com/avatar.jpg"
 
-    test_file = tmp_path / "avatar.jpg"
-    test_file.write_bytes(b"fake image content")
-
-    with open(test_file, "rb") as f:
+    with open(avatar_file, "rb") as f:
         files = {"file": ("avatar.jpg", f, "image/jpeg")}
         response = client.patch(
             "api/users/avatar",
@@ -81,3 +99,15 @@ async def test_update_avatar_user_with_admin_role(
     assert data["email"] == test_user_data.get("email")
     assert data["avatar"] == "http://example.com/avatar.jpg"
     assert "id" in data
+
+
+def test_me_rate_limited(client, get_token):
+    statuses = [
+        client.get(
+            "api/users/me",
+            headers={"Authorization": f"Bearer {get_token}"},
+        ).status_code
+        for _ in range(6)
+    ]
+
+    assert statuses == [200] * 5 + [429]
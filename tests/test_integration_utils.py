@@ -0,0 +1,23 @@
+from unittest.mock import patch
+
+from src.api import utils
+
+
+def test_healthchecker(client, monkeypatch):
+    monkeypatch.setattr(utils, "_last_healthy_at", None)
+
+    response = client.get("api/healthchecker")
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"message": "Welcome to FastAPI!"}
+    assert utils._last_healthy_at is not None
+
+
+def test_healthchecker_reuses_recent_check(client, monkeypatch):
+    monkeypatch.setattr(utils, "_last_healthy_at", None)
+    client.get("api/healthchecker")
+
+    with patch("src.api.utils.text", side_effect=AssertionError("query executed")):
+        response = client.get("api/healthchecker")
+
+    assert response.status_code == 200, response.text
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from src.cache.memory_cache import TTLCache
+
+
+def test_get_missing_key():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    assert cache.get("missing") is None
+
+
+def test_set_and_get():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    assert len(cache) == 1
+
+
+def test_expired_entry_is_dropped():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    with patch("src.cache.memory_cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value")
+    with patch("src.cache.memory_cache.time.monotonic", return_value=160.0):
+        assert cache.get("key") is None
+
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.get("first")
+    cache.set("third", 3)
+
+    assert cache.get("first") == 1
+    assert cache.get("second") is None
+    assert cache.get("third") == 3
+
+
+def test_pop_and_clear():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("first", 1)
+    cache.set("second", 2)
+
+    cache.pop("first")
+    cache.pop("missing")
+    assert cache.get("first") is None
+
+    cache.clear()
+    assert len(cache) == 0
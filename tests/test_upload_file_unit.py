@@ -0,0 +1,54 @@
+import httpx
+import pytest
+from unittest.mock import MagicMock
+
+from src.service.upload_file import UploadFileService
+
+
+@pytest.fixture
+def upload_file_service():
+    return UploadFileService("demo", "123", "abcd")
+
+
+def test_sign(upload_file_service):
+    # Example from the Cloudinary signature documentation
+    signature = upload_file_service.sign(
+        {
+            "timestamp": "1315060510",
+            "public_id": "sample_image",
+            "eager": "w_400,h_300,c_pad|w_260,h_200,c_crop",
+        }
+    )
+
+    assert signature == "bfd09f95f331f558cbd1320e67aa8d488770583e"
+
+
+@pytest.mark.asyncio
+async def test_upload_file(upload_file_service, monkeypatch):
+    # Setup
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"version": 42})
+
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "src.service.upload_file.httpx.AsyncClient",
+        lambda **kwargs: async_client(transport=httpx.MockTransport(handler)),
+    )
+    file = MagicMock(filename="avatar.jpg", content_type="image/jpeg")
+    file.file = b"fake image content"
+
+    # Call method
+    url = await upload_file_service.upload_file(file, "testuser")
+
+    # Assertions
+    assert str(requests[0].url) == upload_file_service.upload_url
+    body = requests[0].read()
+    assert b'name="public_id"\r\n\r\nRestApp/testuser' in body
+    assert b'name="api_key"\r\n\r\n123' in body
+    assert b"fake image content" in body
+    assert url.startswith("https://res.cloudinary.com/demo/")
+    assert "v42/RestApp/testuser" in url
+    assert "c_fill,h_250,w_250" in url
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import fakeredis
+import pytest
+
+from src.database.models import User, UserRole
+from src.service.users_cache import UserCacheService
+
+
+@pytest.fixture
+def user_cache_service():
+    return UserCacheService(fakeredis.FakeAsyncRedis())
+
+
+@pytest.mark.asyncio
+async def test_get_user_from_cache_missing(user_cache_service):
+    assert await user_cache_service.get_user_from_cache("testuser") is None
+
+
+@pytest.mark.asyncio
+async def test_set_and_get_user_from_cache(user_cache_service):
+    # Setup
+    user = User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        hashed_password="hashed_password",
+        is_confirmed=True,
+        created_at=datetime(2025, 1, 1, 12, 0),
+        avatar="https://example.com/avatar.png",
+        role=UserRole.ADMIN,
+    )
+
+    # Call method
+    await user_cache_service.set_user_to_cache(user)
+    cached = await user_cache_service.get_user_from_cache("testuser")
+
+    # Assertions
+    assert cached.to_dict() == user.to_dict()
+    assert cached.role is UserRole.ADMIN
+
+
+@pytest.mark.asyncio
+async def test_bump_user_version(user_cache_service):
+    # Setup
+    user = User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        created_at=datetime(2025, 1, 1, 12, 0),
+        role=UserRole.USER,
+    )
+    await user_cache_service.set_user_to_cache(user)
+
+    # Call method
+    await user_cache_service.bump_user_version("testuser")
+
+    # Assertions
+    assert await user_cache_service.get_user_version("testuser") == b"1"
+    assert await user_cache_service.get_user_from_cache("testuser") is None
+
+
+@pytest.mark.asyncio
+async def test_set_and_clear_missing(user_cache_service):
+    # Call method
+    await user_cache_service.set_missing("email", "test@example.com")
+    await user_cache_service.set_missing("username", "testuser")
+
+    # Assertions
+    assert await user_cache_service.is_missing("email", "test@example.com")
+    assert await user_cache_service.is_missing("username", "testuser")
+    assert not await user_cache_service.is_missing("email", "other@example.com")
+    assert await user_cache_service.redis.ttl("noexist:email:test@example.com") == 30
+
+    await user_cache_service.clear_missing("test@example.com", "testuser")
+    assert not await user_cache_service.is_missing("email", "test@example.com")
+    assert not await user_cache_service.is_missing("username", "testuser")
+
+
+@pytest.mark.asyncio
+async def test_get_user_and_version(user_cache_service):
+    # Setup
+    user = User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        created_at=datetime(2025, 1, 1, 12, 0),
+        role=UserRole.USER,
+    )
+    assert await user_cache_service.get_user_and_version("testuser") == (None, None)
+    await user_cache_service.bump_user_version("testuser")
+    await user_cache_service.set_user_to_cache(user)
+
+    # Call method
+    cached, version = await user_cache_service.get_user_and_version("testuser")
+
+    # Assertions
+    assert cached.to_dict() == user.to_dict()
+    assert version == b"1"
@@ -2,6 +2,7 @@ from datetime import date
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import User, UserRole
@@ -25,7 +26,7 @@ async def test_get_user_by_id(user_repository, mock_session):
     # Setup
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = User(id=1, username="testuser")
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
     result = await user_repository.get_user_by_id(user_id=1)
@@ -41,7 +42,7 @@ async def test_get_user_by_username(user_repository, mock_session):
     # Setup
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = User(id=1, username="testuser")
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
     result = await user_repository.get_user_by_username(username="testuser")
@@ -59,7 +60,7 @@ async def test_get_user_by_email(user_repository, mock_session):
     mock_result.scalar_one_or_none.return_value = User(
         id=1, username="testuser", email="testemail@example.com"
     )
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
     result = await user_repository.get_user_by_email(email="testemail@example.com")
@@ -71,6 +72,30 @@ async def test_get_user_by_email(user_repository, mock_session):
     assert result.email == "testemail@example.com"
 
 
+@pytest.mark.asyncio
+async def test_get_user_by_email_or_username(user_repository, mock_session):
+    # Setup
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = User(
+        id=1, username="otheruser", email="testemail@example.com"
+    )
+    mock_session.execute.return_value = mock_result
+
+    # Call method
+    result = await user_repository.get_user_by_email_or_username(
+        email="testemail@example.com", username="testuser"
+    )
+
+    # Assertions
+    assert result.email == "testemail@example.com"
+    stmt = mock_session.execute.await_args.args[0]
+    # The user holding the email comes first when another user holds the username
+    assert [str(clause) for clause in stmt._order_by_clauses] == [
+        str((User.email == "testemail@example.com").desc())
+    ]
+    assert stmt._limit == 1
+
+
 @pytest.mark.asyncio
 async def test_create_user(user_repository, mock_session):
     # Setup
@@ -100,25 +125,126 @@ async def test_create_user(user_repository, mock_session):
 
 
 @pytest.mark.asyncio
-async def test_confirmed_email(user_repository, mock_session):
+async def test_create_user_if_absent(user_repository, mock_session):
     # Setup
+    user_data = UserCreate(
+        username="testuser",
+        email="testemail@example.com",
+        password="hashedpassword",
+        role=UserRole.USER,
+    )
     mock_result = MagicMock()
-    mock_result.scalar_one_or_none.return_value = User(
-        id=1, username="testuser", email="testemail@example.com", is_confirmed=False
+    mock_result.scalar_one.return_value = User(
+        id=1, username="testuser", email="testemail@example.com"
     )
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
-    result = await user_repository.confirmed_email(email="testemail@example.com")
+    result = await user_repository.create_user_if_absent(
+        body=user_data, avatar="https://example.com/test.png"
+    )
 
     # Assertions
     assert isinstance(result, User)
-    assert result.username == "testuser"
-    assert result.email == "testemail@example.com"
-    assert result.is_confirmed == True
+    assert result.id == 1
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_user_if_absent_conflict(user_repository, mock_session):
+    # Setup
+    user_data = UserCreate(
+        username="testuser",
+        email="testemail@example.com",
+        password="hashedpassword",
+        role=UserRole.USER,
+    )
+    mock_session.execute.side_effect = IntegrityError(
+        "INSERT", {}, Exception("UNIQUE constraint failed: users.email")
+    )
+
+    # Call method
+    result = await user_repository.create_user_if_absent(body=user_data)
+
+    # Assertions
+    assert result is None
+    mock_session.commit.assert_not_called()
+    mock_session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_user_if_absent_conflict_postgres(user_repository, mock_session):
+    # Setup
+    user_data = UserCreate(
+        username="testuser",
+        email="testemail@example.com",
+        password="hashedpassword",
+        role=UserRole.USER,
+    )
+    unique_violation = Exception("duplicate key value violates unique constraint")
+    unique_violation.sqlstate = "23505"
+    mock_session.execute.side_effect = IntegrityError("INSERT", {}, unique_violation)
+
+    # Call method
+    result = await user_repository.create_user_if_absent(body=user_data)
+
+    # Assertions
+    assert result is None
+    mock_session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_user_if_absent_other_constraint(user_repository, mock_session):
+    # Setup
+    user_data = UserCreate(
+        username="testuser",
+        email="testemail@example.com",
+        password="hashedpassword",
+        role=UserRole.USER,
+    )
+    mock_session.execute.side_effect = IntegrityError(
+        "INSERT", {}, Exception("NOT NULL constraint failed: users.username")
+    )
+
+    # Call method
+    with pytest.raises(IntegrityError):
+        await user_repository.create_user_if_absent(body=user_data)
+
+    # Assertions
+    mock_session.commit.assert_not_called()
+    mock_session.rollback.assert_awaited_once()
 
+
+@pytest.mark.asyncio
+async def test_confirmed_email(user_repository, mock_session):
+    # Setup
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = "testuser"
+    mock_session.execute.return_value = mock_result
+
+    # Call method
+    result = await user_repository.confirmed_email(email="testemail@example.com")
+
+    # Assertions
+    assert result == "testuser"
+
+    mock_session.execute.assert_awaited_once()
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(result)
+
+
+@pytest.mark.asyncio
+async def test_confirmed_email_not_updated(user_repository, mock_session):
+    # Setup
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    # Call method
+    result = await user_repository.confirmed_email(email="testemail@example.com")
+
+    # Assertions
+    assert result is None
 
 
 @pytest.mark.asyncio
@@ -131,7 +257,7 @@ async def test_update_avatar_url(user_repository, mock_session):
         email="testemail@example.com",
         avatar="https://example.com/test.png",
     )
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
     result = await user_repository.update_avatar_url(
@@ -149,7 +275,7 @@ async def test_update_avatar_url(user_repository, mock_session):
 
 
 @pytest.mark.asyncio
-async def test_update_avatar_url(user_repository, mock_session):
+async def test_reset_password(user_repository, mock_session):
     # Setup
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = User(
@@ -158,7 +284,7 @@ async def test_update_avatar_url(user_repository, mock_session):
         email="testemail@example.com",
         hashed_password="hashed_password",
     )
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
     result = await user_repository.reset_password(
@@ -176,11 +302,11 @@ async def test_update_avatar_url(user_repository, mock_session):
 
 
 @pytest.mark.asyncio
-async def test_update_avatar_url_not_found(user_repository, mock_session):
+async def test_reset_password_not_found(user_repository, mock_session):
     # Setup
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = None
-    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.execute.return_value = mock_result
 
     # Call method
     result = await user_repository.reset_password(